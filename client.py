@@ -10,17 +10,22 @@ This client demonstrates:
 """
 
 import argparse
+import asyncio
+import atexit
 import base64
 import hashlib
+import html
 import json
+import os
 import secrets
 import sys
+import threading
 import time
 import webbrowser
-from datetime import datetime, timedelta, timezone
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import parse_qs, urlencode, urlparse
 
 try:
@@ -29,8 +34,60 @@ except ImportError:
     print("Error: httpx is required. Install with: pip install httpx")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: faster JSON-RPC encoding/decoding
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    _json_loads = json.loads
+
+# Headers for JSON request bodies sent as pre-encoded content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Callback page bodies (built once, written as-is by the callback handler)
+_SUCCESS_HTML = b"""
+<html>
+<head><title>Authorization Successful</title></head>
+<body>
+    <h1>Authorization Successful!</h1>
+    <p>You can close this window and return to the terminal.</p>
+</body>
+</html>
+"""
+
+_INVALID_HTML = b"""
+<html>
+<head><title>Invalid Request</title></head>
+<body>
+    <h1>Invalid Callback</h1>
+    <p>No authorization code or error received.</p>
+</body>
+</html>
+"""
+
+_ERROR_HTML_TEMPLATE = """
+<html>
+<head><title>Authorization Failed</title></head>
+<body>
+    <h1>Authorization Failed</h1>
+    <p>Error: {error}</p>
+    <p>Description: {description}</p>
+</body>
+</html>
+"""
+
 
-def create_oauth_callback_handler(result_container: dict):
+def create_oauth_callback_handler(
+    result_container: dict,
+    received: Optional[threading.Event] = None
+):
     """
     Factory function to create OAuth callback handler with isolated state.
 
@@ -39,6 +96,7 @@ def create_oauth_callback_handler(result_container: dict):
 
     Args:
         result_container: Dict to store callback results (code, state, error)
+        received: Event set once a code or error has been stored
 
     Returns:
         Handler class for HTTPServer
@@ -46,6 +104,13 @@ def create_oauth_callback_handler(result_container: dict):
     class OAuthCallbackHandler(BaseHTTPRequestHandler):
         """HTTP handler for OAuth callback (instance-isolated)."""
 
+        def _send_html(self, status_code: int, body: bytes):
+            """Send an HTML response."""
+            self.send_response(status_code)
+            self.send_header("Content-type", "text/html")
+            self.end_headers()
+            self.wfile.write(body)
+
         def do_GET(self):
             """Handle OAuth callback GET request."""
             # Parse query parameters
@@ -59,51 +124,24 @@ def create_oauth_callback_handler(result_container: dict):
                 result_container["state"] = query_params.get("state", [None])[0]
 
                 # Send success response
-                self.send_response(200)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(b"""
-                    <html>
-                    <head><title>Authorization Successful</title></head>
-                    <body>
-                        <h1>Authorization Successful!</h1>
-                        <p>You can close this window and return to the terminal.</p>
-                    </body>
-                    </html>
-                """)
+                self._send_html(200, _SUCCESS_HTML)
+                if received is not None:
+                    received.set()
             elif "error" in query_params:
                 result_container["error"] = query_params["error"][0]
                 error_description = query_params.get("error_description", ["Unknown error"])[0]
 
-                # Send error response
-                self.send_response(400)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                error_msg = result_container["error"]
-                self.wfile.write(f"""
-                    <html>
-                    <head><title>Authorization Failed</title></head>
-                    <body>
-                        <h1>Authorization Failed</h1>
-                        <p>Error: {error_msg}</p>
-                        <p>Description: {error_description}</p>
-                    </body>
-                    </html>
-                """.encode())
+                # Send error response (values come from the URL, so escape them)
+                body = _ERROR_HTML_TEMPLATE.format(
+                    error=html.escape(result_container["error"]),
+                    description=html.escape(error_description),
+                )
+                self._send_html(400, body.encode('utf-8', 'replace'))
+                if received is not None:
+                    received.set()
             else:
                 # Invalid callback
-                self.send_response(400)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                self.wfile.write(b"""
-                    <html>
-                    <head><title>Invalid Request</title></head>
-                    <body>
-                        <h1>Invalid Callback</h1>
-                        <p>No authorization code or error received.</p>
-                    </body>
-                    </html>
-                """)
+                self._send_html(400, _INVALID_HTML)
 
         def log_message(self, format, *args):
             """Suppress server logs."""
@@ -112,6 +150,32 @@ def create_oauth_callback_handler(result_container: dict):
     return OAuthCallbackHandler
 
 
+def _emit(*lines: str):
+    """Print a block of status lines with a single write to stdout."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _jwt_exp(token: str) -> Optional[int]:
+    """
+    Read the exp claim from a JWT without verifying its signature.
+
+    Only the payload segment is base64url-decoded; the client just needs the
+    expiry time, so no JWT library is required. Signatures aren't checked
+    here: by default the server signs with a shared HS256 secret and its JWKS
+    is empty; only in EdDSA mode does it advertise a jwks_uri whose key could
+    verify tokens offline.
+
+    Returns:
+        The exp claim as epoch seconds, or None if the token can't be parsed
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
 class PKCEHelper:
     """Helper for generating PKCE parameters."""
 
@@ -120,52 +184,103 @@ class PKCEHelper:
         """Generate a PKCE code verifier."""
         return base64.urlsafe_b64encode(
             secrets.token_bytes(32)
-        ).decode('utf-8').rstrip('=')
+        ).rstrip(b'=').decode('ascii')
 
     @staticmethod
     def generate_code_challenge(verifier: str) -> str:
         """Generate a PKCE code challenge from verifier using S256."""
-        digest = hashlib.sha256(verifier.encode('utf-8')).digest()
-        return base64.urlsafe_b64encode(digest).decode('utf-8').rstrip('=')
+        digest = hashlib.sha256(verifier.encode('ascii')).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode('ascii')
+
+    @staticmethod
+    def generate_pair() -> tuple[str, str]:
+        """
+        Generate a PKCE (verifier, challenge) pair using S256.
+
+        The verifier stays as bytes until both values are computed, so it is
+        hashed without a str -> bytes round trip.
+        """
+        verifier = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b'=')
+        challenge = base64.urlsafe_b64encode(hashlib.sha256(verifier).digest()).rstrip(b'=')
+        return verifier.decode('ascii'), challenge.decode('ascii')
 
 
 class ClientStorage:
     """Persistent storage for OAuth client data."""
 
+    # Minimum seconds between writes; saves inside this window are coalesced
+    FLUSH_INTERVAL = 5.0
+
     def __init__(self, storage_path: Path):
         self.storage_path = storage_path
         self.data: Dict[str, Any] = {"clients": {}}
+        self._dirty = False
+        self._last_flush = float("-inf")
         self.load()
 
+        # Drain any coalesced writes when the process exits; close()
+        # unregisters it so a closed storage isn't kept alive until exit
+        atexit.register(self.flush)
+
     def load(self):
         """Load client data from file."""
         if self.storage_path.exists():
             try:
-                with open(self.storage_path, 'r') as f:
-                    self.data = json.load(f)
-                    if "clients" not in self.data:
-                        self.data["clients"] = {}
+                # Parse raw bytes directly (orjson when available)
+                self.data = _json_loads(self.storage_path.read_bytes())
+                if "clients" not in self.data:
+                    self.data["clients"] = {}
             except (json.JSONDecodeError, IOError) as e:
                 print(f"Warning: Could not load storage file: {e}")
                 self.data = {"clients": {}}
 
     def save(self):
-        """Save client data to file."""
+        """
+        Mark client data as changed and write it out if due.
+
+        Writes are coalesced: the file is rewritten at most once per
+        FLUSH_INTERVAL, and pending changes are flushed by close() or at
+        exit.
+        """
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Write pending client data to file."""
+        if not self._dirty:
+            return
+
         try:
             # Create parent directory if it doesn't exist
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.storage_path, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            # Write compact JSON to a temp file, then atomically swap it in
+            # so a crash mid-write never leaves a truncated storage file
+            tmp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(self.data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.storage_path)
         except IOError as e:
             print(f"Error: Could not save storage file: {e}")
+            return
+
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush pending client data and drop the exit hook."""
+        self.flush()
+        atexit.unregister(self.flush)
 
     def get_client(self, server_url: str) -> Optional[Dict[str, Any]]:
         """Get client data for a server."""
         return self.data["clients"].get(server_url)
 
     def save_client(self, server_url: str, client_data: Dict[str, Any]):
-        """Save client data for a server."""
+        """Save client data for a server (no-op if the entry is unchanged)."""
+        if self.data["clients"].get(server_url) == client_data:
+            return
         self.data["clients"][server_url] = client_data
         self.save()
 
@@ -183,28 +298,200 @@ class ClientStorage:
 class MCPOAuthClient:
     """MCP client with OAuth 2.0 and Dynamic Client Registration support."""
 
+    # Seconds an unanswered authorization attempt's state/PKCE may be reused
+    PENDING_AUTH_TTL = 60.0
+
+    # OAuth endpoints persisted with the client so later runs skip discovery
+    ENDPOINT_KEYS = ("registration_endpoint", "authorization_endpoint", "token_endpoint")
+
     def __init__(self, server_url: str, storage: ClientStorage, redirect_port: int = 3000):
         self.server_url = server_url.rstrip('/')
         self.storage = storage
         self.redirect_port = redirect_port
         self.redirect_uri = f"http://localhost:{redirect_port}/callback"
 
+        # MCP endpoint URLs (fixed for the lifetime of the client)
+        self._tools_list_url = f"{self.server_url}/mcp/tools/list"
+        self._tools_call_url = f"{self.server_url}/mcp/tools/call"
+
         # Client credentials
         self.client_id: Optional[str] = None
         self.client_secret: Optional[str] = None
 
         # OAuth tokens
-        self.access_token: Optional[str] = None
+        self.access_token: Optional[str] = None  # Also sets self._auth_headers
         self.refresh_token: Optional[str] = None
-        self.token_expires_at: Optional[datetime] = None
+        self._expires_epoch: Optional[int] = None  # UTC epoch seconds
+
+        # Serializes token refreshes across threads sharing this client
+        self._refresh_lock = threading.Lock()
 
         # PKCE parameters
         self.code_verifier: Optional[str] = None
         self.code_challenge: Optional[str] = None
 
+        # (verifier, challenge, state, ended_at) of an unanswered authorize()
+        self._pending_auth: Optional[tuple[str, str, str, float]] = None
+
+        # Shared HTTP client (created lazily, reused across all requests)
+        self._http: Optional[httpx.Client] = None
+
+        # Discovered server metadata (fetched at most once per instance)
+        self._metadata: Optional[Dict[str, Any]] = None
+
+        # Known OAuth endpoint URLs (from discovery or storage)
+        self._endpoints: Dict[str, str] = {}
+
         # Load existing client if available
         self._load_client()
 
+    def __enter__(self):
+        """Enter context manager; the HTTP client is created on first use."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit context manager, writing out storage and closing connections."""
+        self.close()
+
+    def __del__(self):
+        """Release pooled connections if the client was never closed."""
+        self._close_http()
+
+    def _get_client(self) -> httpx.Client:
+        """
+        Get the shared HTTP client, creating it on first use.
+
+        Reusing one pooled client keeps the connection to the server alive
+        between calls instead of paying a new TCP handshake per request.
+        """
+        if self._http is None:
+            self._http = httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            )
+        return self._http
+
+    def close(self):
+        """
+        Flush coalesced storage writes and close the shared HTTP client.
+
+        Refreshed tokens reach disk here rather than only at interpreter exit,
+        so they survive a later crash and other readers of the file see them.
+        """
+        self.storage.flush()
+        self._close_http()
+
+    def _close_http(self):
+        """Close the shared HTTP client and release pooled connections."""
+        http = getattr(self, "_http", None)
+        if http is not None:
+            http.close()
+            self._http = None
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """Current OAuth access token."""
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value: Optional[str]):
+        """Set the access token and rebuild the cached Authorization header."""
+        self._access_token = value
+        if value:
+            self._auth_headers = {**_JSON_HEADERS, "Authorization": f"Bearer {value}"}
+        else:
+            self._auth_headers = _JSON_HEADERS
+
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        """Access token expiration as a naive UTC datetime (for display)."""
+        if self._expires_epoch is None:
+            return None
+        return datetime.fromtimestamp(self._expires_epoch, tz=timezone.utc).replace(tzinfo=None)
+
+    @token_expires_at.setter
+    def token_expires_at(self, value: Optional[datetime]):
+        """Set expiration from a naive UTC datetime."""
+        if value is None:
+            self._expires_epoch = None
+        else:
+            self._expires_epoch = int(value.replace(tzinfo=timezone.utc).timestamp())
+
+    def _post(
+        self,
+        url: str,
+        failure: str,
+        *,
+        json_body: Optional[Dict[str, Any]] = None,
+        form: Optional[Dict[str, Any]] = None,
+        headers: Dict[str, str] = _JSON_HEADERS
+    ) -> Optional[Dict[str, Any]]:
+        """
+        POST to the server and decode the JSON response.
+
+        Sends either a JSON body (encoded with orjson when available) or
+        form data over the shared HTTP client.
+
+        Args:
+            url: Endpoint URL
+            failure: Message prefix printed when the server rejects the request
+            json_body: JSON request body
+            form: Form-encoded request body (used instead of json_body)
+            headers: Request headers for JSON bodies
+
+        Returns:
+            Decoded response body, or None on network error or non-200 status
+        """
+        try:
+            if form is not None:
+                response = self._get_client().post(url, data=form)
+            else:
+                response = self._get_client().post(
+                    url, content=_json_dumps(json_body), headers=headers
+                )
+        except httpx.RequestError as e:
+            print(f"❌ Request error: {e}")
+            return None
+
+        return self._decode_response(response, failure)
+
+    @staticmethod
+    def _decode_response(response: httpx.Response, failure: str) -> Optional[Dict[str, Any]]:
+        """Decode a JSON response body, printing the failure on non-200 status."""
+        if response.status_code != 200:
+            _emit(f"❌ {failure}: {response.status_code}", f"   {response.text}")
+            return None
+
+        return _json_loads(response.content)
+
+    async def _post_many_async(
+        self,
+        url: str,
+        failure: str,
+        bodies: List[Dict[str, Any]],
+        headers: Dict[str, str]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        POST several JSON bodies concurrently and decode the responses.
+
+        Uses one AsyncClient for the whole batch; it is scoped to this call
+        because async connections are bound to the running event loop.
+
+        Returns:
+            Decoded response bodies in request order (None for failures)
+        """
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        ) as client:
+            async def post(body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                try:
+                    response = await client.post(url, content=_json_dumps(body), headers=headers)
+                except httpx.RequestError as e:
+                    print(f"❌ Request error: {e}")
+                    return None
+                return self._decode_response(response, failure)
+
+            return await asyncio.gather(*(post(body) for body in bodies))
+
     def _load_client(self):
         """Load client data from storage."""
         client_data = self.storage.get_client(self.server_url)
@@ -213,14 +500,26 @@ class MCPOAuthClient:
             self.client_secret = client_data.get("client_secret")
             self.access_token = client_data.get("access_token")
             self.refresh_token = client_data.get("refresh_token")
+            self._endpoints = client_data.get("endpoints") or {}
 
-            # Parse token expiration
-            expires_str = client_data.get("token_expires_at")
-            if expires_str:
-                self.token_expires_at = datetime.fromisoformat(expires_str)
+            # Token expiration is stored as UTC epoch seconds
+            expires_at = client_data.get("token_expires_at")
+            if isinstance(expires_at, str):
+                # Legacy ISO-8601 format
+                self.token_expires_at = datetime.fromisoformat(expires_at)
+            elif expires_at is not None:
+                self._expires_epoch = int(expires_at)
 
     def _save_client(self):
         """Save client data to storage."""
+        # Keep the original registration time for the same client so that
+        # re-saving unchanged credentials doesn't count as a change
+        existing = self.storage.get_client(self.server_url)
+        if existing and existing.get("client_id") == self.client_id:
+            registered_at = existing.get("registered_at")
+        else:
+            registered_at = datetime.now().isoformat()
+
         client_data = {
             "server_url": self.server_url,
             "client_id": self.client_id,
@@ -228,23 +527,31 @@ class MCPOAuthClient:
             "redirect_uri": self.redirect_uri,
             "access_token": self.access_token,
             "refresh_token": self.refresh_token,
-            "token_expires_at": self.token_expires_at.isoformat() if self.token_expires_at else None,
-            "registered_at": datetime.now().isoformat(),
+            "token_expires_at": self._expires_epoch,
+            "endpoints": self._endpoints or None,
+            "registered_at": registered_at,
         }
         self.storage.save_client(self.server_url, client_data)
 
     def discover_metadata(self) -> Dict[str, Any]:
         """Discover OAuth and MCP metadata from server."""
+        if self._metadata is not None:
+            return self._metadata
+
         print(f"\n📡 Discovering server metadata...")
 
         try:
-            with httpx.Client() as client:
-                # Try OAuth Authorization Server Metadata (RFC 8414)
-                response = client.get(f"{self.server_url}/.well-known/oauth-authorization-server")
-                if response.status_code == 200:
-                    metadata = response.json()
-                    print(f"✓ OAuth metadata discovered")
-                    return metadata
+            client = self._get_client()
+            # Try OAuth Authorization Server Metadata (RFC 8414)
+            response = client.get(f"{self.server_url}/.well-known/oauth-authorization-server")
+            if response.status_code == 200:
+                metadata = _json_loads(response.content)
+                print(f"✓ OAuth metadata discovered")
+                self._metadata = metadata
+                self._endpoints = {
+                    key: metadata[key] for key in self.ENDPOINT_KEYS if metadata.get(key)
+                }
+                return metadata
         except httpx.RequestError as e:
             print(f"⚠ Could not discover metadata: {e}")
 
@@ -257,6 +564,13 @@ class MCPOAuthClient:
             "token_endpoint": f"{self.server_url}/oauth/token",
         }
 
+    def _endpoint(self, name: str) -> Optional[str]:
+        """Get an OAuth endpoint URL, discovering metadata only if it's unknown."""
+        url = self._endpoints.get(name)
+        if url is None:
+            url = self.discover_metadata().get(name)
+        return url
+
     def register_client(self, client_name: str = "MCP DCR Client", scopes: Optional[list] = None) -> bool:
         """Register client via Dynamic Client Registration (RFC 7591)."""
         print(f"\n🔐 Registering new OAuth client...")
@@ -264,9 +578,8 @@ class MCPOAuthClient:
         if scopes is None:
             scopes = ["mcp:tools:read", "mcp:tools:execute"]
 
-        # Discover metadata
-        metadata = self.discover_metadata()
-        registration_endpoint = metadata.get("registration_endpoint")
+        # Resolve endpoints (discovers metadata only if not already known)
+        registration_endpoint = self._endpoint("registration_endpoint")
 
         if not registration_endpoint:
             print("❌ No registration endpoint found")
@@ -279,32 +592,26 @@ class MCPOAuthClient:
             "scope": " ".join(scopes),
         }
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(registration_endpoint, json=registration_request)
-
-                if response.status_code == 200:
-                    registration_response = response.json()
-                    self.client_id = registration_response["client_id"]
-                    self.client_secret = registration_response.get("client_secret")
-
-                    print(f"✓ Client registered successfully")
-                    print(f"  Client ID: {self.client_id}")
-                    if self.client_secret:
-                        print(f"  Client Secret: {self.client_secret[:10]}...")
-
-                    # Save to storage
-                    self._save_client()
-                    return True
-                else:
-                    print(f"❌ Registration failed: {response.status_code}")
-                    print(f"   {response.text}")
-                    return False
-
-        except httpx.RequestError as e:
-            print(f"❌ Request error: {e}")
+        registration_response = self._post(
+            registration_endpoint,
+            "Registration failed",
+            json_body=registration_request
+        )
+        if registration_response is None:
             return False
 
+        self.client_id = registration_response["client_id"]
+        self.client_secret = registration_response.get("client_secret")
+
+        lines = ["✓ Client registered successfully", f"  Client ID: {self.client_id}"]
+        if self.client_secret:
+            lines.append(f"  Client Secret: {self.client_secret[:10]}...")
+        _emit(*lines)
+
+        # Save to storage
+        self._save_client()
+        return True
+
     def authorize(self) -> bool:
         """Perform OAuth 2.0 authorization code flow with PKCE."""
         print(f"\n🔑 Starting OAuth authorization flow...")
@@ -313,21 +620,25 @@ class MCPOAuthClient:
             print("❌ Client not registered. Run register_client() first.")
             return False
 
-        # Discover metadata
-        metadata = self.discover_metadata()
-        authorization_endpoint = metadata.get("authorization_endpoint")
-        token_endpoint = metadata.get("token_endpoint")
+        # Resolve endpoints (discovers metadata only if not already known)
+        authorization_endpoint = self._endpoint("authorization_endpoint")
+        token_endpoint = self._endpoint("token_endpoint")
 
         if not authorization_endpoint or not token_endpoint:
             print("❌ Missing OAuth endpoints")
             return False
 
-        # Generate PKCE parameters
-        self.code_verifier = PKCEHelper.generate_code_verifier()
-        self.code_challenge = PKCEHelper.generate_code_challenge(self.code_verifier)
+        # Reuse PKCE parameters and state from an attempt that timed out moments
+        # ago (e.g. the user retries immediately); otherwise generate new ones
+        pending = self._pending_auth
+        if pending and time.monotonic() - pending[3] < self.PENDING_AUTH_TTL:
+            self.code_verifier, self.code_challenge, state, _ = pending
+        else:
+            # Generate PKCE parameters
+            self.code_verifier, self.code_challenge = PKCEHelper.generate_pair()
 
-        # Generate state for CSRF protection
-        state = secrets.token_urlsafe(32)
+            # Generate state for CSRF protection
+            state = secrets.token_urlsafe(32)
 
         # Build authorization URL
         auth_params = {
@@ -343,8 +654,10 @@ class MCPOAuthClient:
 
         auth_url = f"{authorization_endpoint}?{urlencode(auth_params)}"
 
-        print(f"✓ Opening browser for authorization...")
-        print(f"  If browser doesn't open, visit: {auth_url}")
+        _emit(
+            "✓ Opening browser for authorization...",
+            f"  If browser doesn't open, visit: {auth_url}",
+        )
 
         # Create result container for this OAuth flow (isolated from other flows)
         callback_result = {
@@ -354,10 +667,17 @@ class MCPOAuthClient:
         }
 
         # Create handler with isolated state via closure
-        handler_class = create_oauth_callback_handler(callback_result)
-
-        # Start local callback server
-        server = HTTPServer(("localhost", self.redirect_port), handler_class)
+        received = threading.Event()
+        handler_class = create_oauth_callback_handler(callback_result, received)
+
+        # Start local callback server in the background; stray requests
+        # (e.g. favicon) are served on their own threads
+        server = ThreadingHTTPServer(("localhost", self.redirect_port), handler_class)
+        threading.Thread(
+            target=server.serve_forever,
+            kwargs={"poll_interval": 0.1},  # bounds shutdown latency
+            daemon=True
+        ).start()
 
         # Open browser
         webbrowser.open(auth_url)
@@ -365,29 +685,40 @@ class MCPOAuthClient:
         # Wait for callback (with timeout)
         print(f"⏳ Waiting for authorization callback...")
         timeout = 120  # 2 minutes
-        start_time = time.time()
 
-        while time.time() - start_time < timeout:
-            server.handle_request()
+        try:
+            received.wait(timeout)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+            # Any answer from the authorization server consumes the attempt;
+            # an unanswered one (timeout, Ctrl-C) stays reusable for a retry
+            if callback_result["authorization_code"] or callback_result["error"]:
+                self._pending_auth = None
+            else:
+                self._pending_auth = (
+                    self.code_verifier, self.code_challenge, state, time.monotonic()
+                )
 
-            # Check if we got a response (via closure-captured result)
-            if callback_result["authorization_code"]:
-                authorization_code = callback_result["authorization_code"]
-                returned_state = callback_result["state"]
+        # Check if we got a response (via closure-captured result)
+        if callback_result["authorization_code"]:
+            authorization_code = callback_result["authorization_code"]
+            returned_state = callback_result["state"]
 
-                # Validate state
-                if returned_state != state:
-                    print("❌ State mismatch - possible CSRF attack!")
-                    return False
+            # Validate state
+            if returned_state != state:
+                print("❌ State mismatch - possible CSRF attack!")
+                return False
 
-                print(f"✓ Authorization code received")
+            print(f"✓ Authorization code received")
 
-                # Exchange code for token
-                return self._exchange_code_for_token(authorization_code, token_endpoint)
+            # Exchange code for token
+            return self._exchange_code_for_token(authorization_code, token_endpoint)
 
-            elif callback_result["error"]:
-                print(f"❌ Authorization error: {callback_result['error']}")
-                return False
+        elif callback_result["error"]:
+            print(f"❌ Authorization error: {callback_result['error']}")
+            return False
 
         print("❌ Authorization timeout")
         return False
@@ -405,48 +736,33 @@ class MCPOAuthClient:
             "resource": self.server_url,  # MCP spec requirement (RFC 8707)
         }
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(token_endpoint, data=token_request)
-
-                if response.status_code == 200:
-                    token_response = response.json()
-                    self.access_token = token_response["access_token"]
-                    self.refresh_token = token_response.get("refresh_token")
-
-                    # Calculate token expiration by parsing JWT exp claim (timezone-safe)
-                    # This ensures correct expiration regardless of client/server timezone
-                    try:
-                        from jose import jwt
-                        claims = jwt.decode(
-                            self.access_token,
-                            options={"verify_signature": False}
-                        )
-                        self.token_expires_at = datetime.fromtimestamp(
-                            claims['exp'],
-                            tz=timezone.utc
-                        ).replace(tzinfo=None)  # Store as naive UTC
-                    except Exception:
-                        # Fallback to expires_in if JWT parsing fails
-                        expires_in = token_response.get("expires_in", 3600)
-                        self.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
-
-                    print(f"✓ Access token obtained")
-                    print(f"  Token: {self.access_token[:30]}...")
-                    print(f"  Expires: {self.token_expires_at.strftime('%Y-%m-%d %H:%M:%S')}")
-
-                    # Save to storage
-                    self._save_client()
-                    return True
-                else:
-                    print(f"❌ Token exchange failed: {response.status_code}")
-                    print(f"   {response.text}")
-                    return False
-
-        except httpx.RequestError as e:
-            print(f"❌ Request error: {e}")
+        token_response = self._post(token_endpoint, "Token exchange failed", form=token_request)
+        if token_response is None:
             return False
 
+        self.access_token = token_response["access_token"]
+        self.refresh_token = token_response.get("refresh_token")
+
+        # Calculate token expiration by parsing JWT exp claim (timezone-safe)
+        # This ensures correct expiration regardless of client/server timezone
+        exp = _jwt_exp(self.access_token)
+        if exp is not None:
+            self._expires_epoch = exp
+        else:
+            # Fallback to expires_in if JWT parsing fails
+            expires_in = token_response.get("expires_in", 3600)
+            self._expires_epoch = int(time.time()) + expires_in
+
+        _emit(
+            "✓ Access token obtained",
+            f"  Token: {self.access_token[:30]}...",
+            f"  Expires: {self.token_expires_at.strftime('%Y-%m-%d %H:%M:%S')}",
+        )
+
+        # Save to storage
+        self._save_client()
+        return True
+
     def refresh_access_token(self) -> bool:
         """Refresh access token using refresh token."""
         print(f"\n🔄 Refreshing access token...")
@@ -455,9 +771,8 @@ class MCPOAuthClient:
             print("❌ No refresh token available")
             return False
 
-        # Discover metadata
-        metadata = self.discover_metadata()
-        token_endpoint = metadata.get("token_endpoint")
+        # Resolve endpoints (discovers metadata only if not already known)
+        token_endpoint = self._endpoint("token_endpoint")
 
         if not token_endpoint:
             print("❌ Token endpoint not found")
@@ -470,58 +785,54 @@ class MCPOAuthClient:
             "resource": self.server_url,  # MCP spec requirement (RFC 8707)
         }
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(token_endpoint, data=refresh_request)
-
-                if response.status_code == 200:
-                    token_response = response.json()
-                    self.access_token = token_response["access_token"]
-
-                    # Update expiration by parsing JWT exp claim (timezone-safe)
-                    try:
-                        from jose import jwt
-                        claims = jwt.decode(
-                            self.access_token,
-                            options={"verify_signature": False}
-                        )
-                        self.token_expires_at = datetime.fromtimestamp(
-                            claims['exp'],
-                            tz=timezone.utc
-                        ).replace(tzinfo=None)  # Store as naive UTC
-                    except Exception:
-                        # Fallback to expires_in if JWT parsing fails
-                        expires_in = token_response.get("expires_in", 3600)
-                        self.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
-
-                    print(f"✓ Token refreshed successfully")
-                    print(f"  New token: {self.access_token[:30]}...")
-
-                    # Save to storage
-                    self._save_client()
-                    return True
-                else:
-                    print(f"❌ Token refresh failed: {response.status_code}")
-                    print(f"   {response.text}")
-                    return False
-
-        except httpx.RequestError as e:
-            print(f"❌ Request error: {e}")
+        token_response = self._post(token_endpoint, "Token refresh failed", form=refresh_request)
+        if token_response is None:
             return False
 
+        self.access_token = token_response["access_token"]
+
+        # Update expiration by parsing JWT exp claim (timezone-safe)
+        exp = _jwt_exp(self.access_token)
+        if exp is not None:
+            self._expires_epoch = exp
+        else:
+            # Fallback to expires_in if JWT parsing fails
+            expires_in = token_response.get("expires_in", 3600)
+            self._expires_epoch = int(time.time()) + expires_in
+
+        _emit("✓ Token refreshed successfully", f"  New token: {self.access_token[:30]}...")
+
+        # Save to storage
+        self._save_client()
+        return True
+
     def ensure_valid_token(self) -> bool:
-        """Ensure we have a valid access token, refreshing if necessary."""
+        """
+        Ensure we have a valid access token, refreshing if necessary.
+
+        The expiry check is in-memory only; the server is contacted just when
+        the token is within 5 minutes of expiring.
+        """
         if not self.access_token:
             print("❌ No access token. Please authorize first.")
             return False
 
-        # Check if token is expired or about to expire (within 5 minutes)
-        # Use UTC to match server timezone
-        if self.token_expires_at and datetime.utcnow() >= self.token_expires_at - timedelta(minutes=5):
+        if not self._token_expiring():
+            return True
+
+        # Double-checked: callers that queued behind an in-flight refresh
+        # see the new expiry and skip issuing a refresh of their own
+        with self._refresh_lock:
+            if not self._token_expiring():
+                return True
             print("⚠ Token expired or expiring soon, refreshing...")
             return self.refresh_access_token()
 
-        return True
+    def _token_expiring(self) -> bool:
+        """Check if the token is expired or expires within 5 minutes."""
+        # Epoch seconds are timezone-independent, matching the JWT exp claim
+        expires = self._expires_epoch
+        return expires is not None and time.time() >= expires - 300
 
     def list_tools(self) -> Optional[list]:
         """List available MCP tools."""
@@ -537,31 +848,54 @@ class MCPOAuthClient:
             "params": {}
         }
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{self.server_url}/mcp/tools/list",
-                    json=list_tools_request,
-                    headers={"Authorization": f"Bearer {self.access_token}"}
-                )
+        tools_response = self._post(
+            self._tools_list_url,
+            "Failed to list tools",
+            json_body=list_tools_request,
+            headers=self._auth_headers
+        )
+        if tools_response is None:
+            return None
 
-                if response.status_code == 200:
-                    tools_response = response.json()
-                    tools = tools_response.get("result", {}).get("tools", [])
+        tools = tools_response.get("result", {}).get("tools", [])
 
-                    print(f"✓ Found {len(tools)} tools:")
-                    for tool in tools:
-                        print(f"  - {tool['name']}: {tool['description']}")
+        _emit(
+            f"✓ Found {len(tools)} tools:",
+            *(f"  - {tool['name']}: {tool['description']}" for tool in tools),
+        )
 
-                    return tools
-                else:
-                    print(f"❌ Failed to list tools: {response.status_code}")
-                    print(f"   {response.text}")
-                    return None
+        return tools
 
-        except httpx.RequestError as e:
-            print(f"❌ Request error: {e}")
-            return None
+    @staticmethod
+    def _tool_call_request(
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]],
+        request_id: int = 2
+    ) -> Dict[str, Any]:
+        """Build a JSON-RPC tools/call request."""
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments if arguments is not None else {}
+            }
+        }
+
+    @staticmethod
+    def _report_tool_result(tool_response: Dict[str, Any]) -> Dict[str, Any]:
+        """Print and return the result of a successful tool call."""
+        result = tool_response.get("result", {})
+
+        lines = ["✓ Tool executed successfully"]
+        if "message" in result:
+            lines.append(f"  Message: {result['message']}")
+        if "data" in result:
+            lines.append(f"  Data: {json.dumps(result['data'], indent=2)}")
+        _emit(*lines)
+
+        return result
 
     def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Call an MCP tool."""
@@ -570,46 +904,51 @@ class MCPOAuthClient:
         if not self.ensure_valid_token():
             return None
 
-        if arguments is None:
-            arguments = {}
+        tool_response = self._post(
+            self._tools_call_url,
+            "Tool call failed",
+            json_body=self._tool_call_request(tool_name, arguments),
+            headers=self._auth_headers
+        )
+        if tool_response is None:
+            return None
 
-        call_tool_request = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
+        return self._report_tool_result(tool_response)
 
-        try:
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{self.server_url}/mcp/tools/call",
-                    json=call_tool_request,
-                    headers={"Authorization": f"Bearer {self.access_token}"}
-                )
+    def call_tools(
+        self,
+        calls: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Call several MCP tools concurrently.
 
-                if response.status_code == 200:
-                    tool_response = response.json()
-                    result = tool_response.get("result", {})
+        The token is validated once up front, then all requests are sent
+        together; results are reported in the order the calls were given.
 
-                    print(f"✓ Tool executed successfully")
-                    if "message" in result:
-                        print(f"  Message: {result['message']}")
-                    if "data" in result:
-                        print(f"  Data: {json.dumps(result['data'], indent=2)}")
+        Args:
+            calls: (tool_name, arguments) pairs
 
-                    return result
-                else:
-                    print(f"❌ Tool call failed: {response.status_code}")
-                    print(f"   {response.text}")
-                    return None
+        Returns:
+            Tool results in call order (None for failed calls)
+        """
+        print(f"\n⚙️  Calling {len(calls)} tools concurrently: {', '.join(name for name, _ in calls)}")
 
-        except httpx.RequestError as e:
-            print(f"❌ Request error: {e}")
-            return None
+        if not self.ensure_valid_token():
+            return [None] * len(calls)
+
+        requests = [
+            self._tool_call_request(name, arguments, request_id)
+            for request_id, (name, arguments) in enumerate(calls, start=2)
+        ]
+        responses = asyncio.run(
+            self._post_many_async(self._tools_call_url, "Tool call failed", requests, self._auth_headers)
+        )
+
+        results = []
+        for (name, _), tool_response in zip(calls, responses):
+            print(f"\n⚙️  Tool: {name}")
+            results.append(None if tool_response is None else self._report_tool_result(tool_response))
+        return results
 
 
 def main():
@@ -686,93 +1025,90 @@ Examples:
         print("\nError: --server-url is required for most actions")
         sys.exit(1)
 
-    # Initialize client
-    client = MCPOAuthClient(args.server_url, storage)
-
-    # Handle demo mode
-    if args.demo:
-        print("=" * 70)
-        print("MCP OAuth DCR Client - Full Demo")
-        print("=" * 70)
-
-        # Step 1: Register
-        if not client.client_id:
-            print("\nStep 1: Client Registration")
-            if not client.register_client():
-                sys.exit(1)
-        else:
-            print(f"\n✓ Client already registered (ID: {client.client_id})")
+    # Initialize client (one pooled HTTP connection shared by every action)
+    with MCPOAuthClient(args.server_url, storage) as client:
+        # Handle demo mode
+        if args.demo:
+            print("=" * 70)
+            print("MCP OAuth DCR Client - Full Demo")
+            print("=" * 70)
+
+            # Step 1: Register
+            if not client.client_id:
+                print("\nStep 1: Client Registration")
+                if not client.register_client():
+                    sys.exit(1)
+            else:
+                print(f"\n✓ Client already registered (ID: {client.client_id})")
 
-        # Step 2: Authorize
-        if not client.access_token:
-            print("\nStep 2: OAuth Authorization")
-            if not client.authorize():
-                sys.exit(1)
-        else:
-            print(f"\n✓ Client already authorized")
-            if not client.ensure_valid_token():
+            # Step 2: Authorize
+            if not client.access_token:
+                print("\nStep 2: OAuth Authorization")
+                if not client.authorize():
+                    sys.exit(1)
+            else:
+                print(f"\n✓ Client already authorized")
+                if not client.ensure_valid_token():
+                    sys.exit(1)
+
+            # Step 3: List tools
+            print("\nStep 3: List MCP Tools")
+            tools = client.list_tools()
+            if not tools:
                 sys.exit(1)
 
-        # Step 3: List tools
-        print("\nStep 3: List MCP Tools")
-        tools = client.list_tools()
-        if not tools:
-            sys.exit(1)
+            # Step 4: Call each tool
+            print("\nStep 4: Call MCP Tools")
 
-        # Step 4: Call each tool
-        print("\nStep 4: Call MCP Tools")
+            # Call get_weather, list_files and get_user_profile concurrently
+            client.call_tools([
+                ("get_weather", {"location": "San Francisco, CA", "units": "fahrenheit"}),
+                ("list_files", {"path": "/home/user"}),
+                ("get_user_profile", {}),
+            ])
 
-        # Call get_weather
-        client.call_tool("get_weather", {"location": "San Francisco, CA", "units": "fahrenheit"})
+            # Step 5: Refresh token
+            print("\nStep 5: Token Refresh")
+            if client.refresh_access_token():
+                print("✓ Token refreshed successfully")
 
-        # Call list_files
-        client.call_tool("list_files", {"path": "/home/user"})
+                # Call another tool with new token
+                client.call_tool("get_weather", {"location": "New York, NY", "units": "celsius"})
 
-        # Call get_user_profile
-        client.call_tool("get_user_profile", {})
+            print("\n" + "=" * 70)
+            print("✅ Demo completed successfully!")
+            print("=" * 70)
+            return
 
-        # Step 5: Refresh token
-        print("\nStep 5: Token Refresh")
-        if client.refresh_access_token():
-            print("✓ Token refreshed successfully")
-
-            # Call another tool with new token
-            client.call_tool("get_weather", {"location": "New York, NY", "units": "celsius"})
-
-        print("\n" + "=" * 70)
-        print("✅ Demo completed successfully!")
-        print("=" * 70)
-        return
+        # Handle individual actions
+        if args.register:
+            if not client.register_client():
+                sys.exit(1)
 
-    # Handle individual actions
-    if args.register:
-        if not client.register_client():
-            sys.exit(1)
+        if args.authorize:
+            if not client.authorize():
+                sys.exit(1)
 
-    if args.authorize:
-        if not client.authorize():
-            sys.exit(1)
+        if args.refresh:
+            if not client.refresh_access_token():
+                sys.exit(1)
 
-    if args.refresh:
-        if not client.refresh_access_token():
-            sys.exit(1)
+        if args.list_tools:
+            if not client.list_tools():
+                sys.exit(1)
 
-    if args.list_tools:
-        if not client.list_tools():
-            sys.exit(1)
+        if args.call_tool:
+            tool_args = {}
+            if args.args:
+                try:
+                    tool_args = json.loads(args.args)
+                except json.JSONDecodeError as e:
+                    print(f"Error: Invalid JSON arguments: {e}")
+                    sys.exit(1)
 
-    if args.call_tool:
-        tool_args = {}
-        if args.args:
-            try:
-                tool_args = json.loads(args.args)
-            except json.JSONDecodeError as e:
-                print(f"Error: Invalid JSON arguments: {e}")
+            if not client.call_tool(args.call_tool, tool_args):
                 sys.exit(1)
 
-        if not client.call_tool(args.call_tool, tool_args):
-            sys.exit(1)
-
 
 if __name__ == "__main__":
     main()
@@ -3,7 +3,7 @@ Configuration settings for the MCP OAuth DCR Server.
 """
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -13,10 +13,17 @@ class Settings(BaseSettings):
     SERVER_URL: str = "http://localhost:8000"
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = 8000
+    # Storage is in-memory and per-process, so more than one worker only
+    # works once storage is shared
+    WORKERS: int = 1
+
+    # CORS (browser clients); a JSON list in the environment
+    CORS_ALLOW_ORIGINS: List[str] = ["*"]
 
     # JWT configuration
     JWT_SECRET_KEY: str = "dev-secret-key-change-in-production"
-    JWT_ALGORITHM: str = "HS256"
+    JWT_ALGORITHM: str = "HS256"  # or "EdDSA" (Ed25519, published via JWKS)
+    JWT_ED25519_PRIVATE_KEY: Optional[str] = None  # base64url 32-byte seed
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
     # OAuth configuration
@@ -26,6 +33,7 @@ class Settings(BaseSettings):
     # MCP configuration
     MCP_SERVER_NAME: str = "Mock MCP Server"
     MCP_SERVER_VERSION: str = "0.1.0"
+    MCP_MAX_BATCH_SIZE: int = 50  # Requests per JSON-RPC batch on /mcp
 
     # Development settings
     DEBUG: bool = True
@@ -8,10 +8,12 @@ A mock Model Context Protocol server implementing:
 - MCP tool execution with OAuth authentication
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import orjson
 
 from app.config import settings
 from app.oauth import metadata, dcr, authorize, token
@@ -24,6 +26,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# Lifespan (startup/shutdown)
+# ============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Log startup information, run the app, then log shutdown."""
+    url = settings.SERVER_URL
+    rule = "=" * 60
+    logger.info("\n".join([
+        rule,
+        "MCP OAuth DCR Server Starting",
+        rule,
+        f"Server URL: {url}",
+        f"Debug Mode: {settings.DEBUG}",
+        f"Log Level: {settings.LOG_LEVEL}",
+        rule,
+        "OAuth Endpoints:",
+        f"  - Registration: {url}/oauth/register",
+        f"  - Authorize: {url}/oauth/authorize",
+        f"  - Token: {url}/oauth/token",
+        rule,
+        "MCP Endpoints:",
+        f"  - Initialize: {url}/mcp/initialize",
+        f"  - Tools List: {url}/mcp/tools/list",
+        f"  - Tools Call: {url}/mcp/tools/call",
+        rule,
+        "Documentation:",
+        f"  - OpenAPI Docs: {url}/docs",
+        f"  - ReDoc: {url}/redoc",
+        rule,
+    ]))
+
+    yield
+
+    logger.info("MCP OAuth DCR Server Shutting Down")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="MCP OAuth DCR Server",
@@ -34,15 +74,19 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Add CORS middleware for browser-based clients
+# Add CORS middleware for browser-based clients. Tokens travel in the
+# Authorization header, not cookies, so credentialed CORS is not needed (and
+# a wildcard origin with credentials would reflect any origin).
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=settings.CORS_ALLOW_ORIGINS,
+    allow_credentials=False,
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 
@@ -76,94 +120,67 @@ app.include_router(authorize.router, tags=["OAuth Authorization"])
 app.include_router(token.router, tags=["OAuth Token"])
 
 # MCP protocol endpoints
-app.include_router(protocol.router, tags=["MCP Protocol"])
+app.include_router(protocol.router, prefix="/mcp", tags=["MCP Protocol"])
+
+# Single /mcp endpoint (JSON-RPC batches)
+app.include_router(protocol.rpc_router, tags=["MCP Protocol"])
 
 
 # ============================================================================
 # Root Endpoints
 # ============================================================================
 
+# Both payloads depend only on settings fixed at startup, so serialize once
+_ROOT_BYTES = orjson.dumps({
+    "name": "MCP OAuth DCR Server",
+    "version": "0.1.0",
+    "description": "Mock MCP server with OAuth 2.0 and Dynamic Client Registration",
+    "endpoints": {
+        "metadata": {
+            "authorization_server": f"{settings.SERVER_URL}/.well-known/oauth-authorization-server",
+            "protected_resource": f"{settings.SERVER_URL}/.well-known/oauth-protected-resource"
+        },
+        "oauth": {
+            "register": f"{settings.SERVER_URL}/oauth/register",
+            "authorize": f"{settings.SERVER_URL}/oauth/authorize",
+            "token": f"{settings.SERVER_URL}/oauth/token"
+        },
+        "mcp": {
+            "initialize": f"{settings.SERVER_URL}/mcp/initialize",
+            "tools_list": f"{settings.SERVER_URL}/mcp/tools/list",
+            "tools_call": f"{settings.SERVER_URL}/mcp/tools/call"
+        },
+        "documentation": {
+            "openapi": f"{settings.SERVER_URL}/docs",
+            "redoc": f"{settings.SERVER_URL}/redoc"
+        }
+    },
+    "standards": [
+        "RFC 7591 - OAuth 2.0 Dynamic Client Registration",
+        "RFC 7636 - Proof Key for Code Exchange (PKCE)",
+        "RFC 8414 - OAuth 2.0 Authorization Server Metadata",
+        "RFC 9728 - OAuth 2.0 Protected Resource Metadata",
+        "MCP Authorization Specification"
+    ]
+})
+
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": "mcp-oauth-dcr-server",
+    "version": "0.1.0"
+})
+
+
 @app.get("/")
 async def root():
     """Root endpoint with server information and links."""
-    return {
-        "name": "MCP OAuth DCR Server",
-        "version": "0.1.0",
-        "description": "Mock MCP server with OAuth 2.0 and Dynamic Client Registration",
-        "endpoints": {
-            "metadata": {
-                "authorization_server": f"{settings.SERVER_URL}/.well-known/oauth-authorization-server",
-                "protected_resource": f"{settings.SERVER_URL}/.well-known/oauth-protected-resource"
-            },
-            "oauth": {
-                "register": f"{settings.SERVER_URL}/oauth/register",
-                "authorize": f"{settings.SERVER_URL}/oauth/authorize",
-                "token": f"{settings.SERVER_URL}/oauth/token"
-            },
-            "mcp": {
-                "initialize": f"{settings.SERVER_URL}/mcp/initialize",
-                "tools_list": f"{settings.SERVER_URL}/mcp/tools/list",
-                "tools_call": f"{settings.SERVER_URL}/mcp/tools/call"
-            },
-            "documentation": {
-                "openapi": f"{settings.SERVER_URL}/docs",
-                "redoc": f"{settings.SERVER_URL}/redoc"
-            }
-        },
-        "standards": [
-            "RFC 7591 - OAuth 2.0 Dynamic Client Registration",
-            "RFC 7636 - Proof Key for Code Exchange (PKCE)",
-            "RFC 8414 - OAuth 2.0 Authorization Server Metadata",
-            "RFC 9728 - OAuth 2.0 Protected Resource Metadata",
-            "MCP Authorization Specification"
-        ]
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    return {
-        "status": "healthy",
-        "service": "mcp-oauth-dcr-server",
-        "version": "0.1.0"
-    }
-
-
-# ============================================================================
-# Startup/Shutdown Events
-# ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """Log startup information."""
-    logger.info("=" * 60)
-    logger.info("MCP OAuth DCR Server Starting")
-    logger.info("=" * 60)
-    logger.info(f"Server URL: {settings.SERVER_URL}")
-    logger.info(f"Debug Mode: {settings.DEBUG}")
-    logger.info(f"Log Level: {settings.LOG_LEVEL}")
-    logger.info("=" * 60)
-    logger.info("OAuth Endpoints:")
-    logger.info(f"  - Registration: {settings.SERVER_URL}/oauth/register")
-    logger.info(f"  - Authorize: {settings.SERVER_URL}/oauth/authorize")
-    logger.info(f"  - Token: {settings.SERVER_URL}/oauth/token")
-    logger.info("=" * 60)
-    logger.info("MCP Endpoints:")
-    logger.info(f"  - Initialize: {settings.SERVER_URL}/mcp/initialize")
-    logger.info(f"  - Tools List: {settings.SERVER_URL}/mcp/tools/list")
-    logger.info(f"  - Tools Call: {settings.SERVER_URL}/mcp/tools/call")
-    logger.info("=" * 60)
-    logger.info("Documentation:")
-    logger.info(f"  - OpenAPI Docs: {settings.SERVER_URL}/docs")
-    logger.info(f"  - ReDoc: {settings.SERVER_URL}/redoc")
-    logger.info("=" * 60)
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Log shutdown information."""
-    logger.info("MCP OAuth DCR Server Shutting Down")
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -172,6 +189,12 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.SERVER_HOST,
         port=settings.SERVER_PORT,
+        # "auto" already selects uvloop and httptools when installed
+        # (uvicorn[standard]) and falls back where they are unavailable
+        loop="auto",
+        http="auto",
+        workers=1 if settings.DEBUG else settings.WORKERS,
         reload=settings.DEBUG,
-        log_level=settings.LOG_LEVEL.lower()
+        log_level=settings.LOG_LEVEL.lower(),
+        access_log=settings.DEBUG,
     )
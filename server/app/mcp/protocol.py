@@ -5,71 +5,123 @@ Implements the core MCP protocol methods:
 - initialize: Server handshake
 - tools/list: List available tools
 - tools/call: Execute a tool (requires authentication)
+
+Routes on `router` are relative; main.py includes it with the /mcp prefix.
+`rpc_router` serves the single /mcp endpoint, which also accepts JSON-RPC
+batches.
 """
 
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, status, Depends, Header
-from app.models import MCPToolCallResponse
-from app.mcp.tools import get_available_tools, execute_tool
-from app.oauth.token import verify_access_token
+import asyncio
+from typing import Dict, Any, List, Mapping, Optional, Union
+import orjson
+from fastapi import APIRouter, Body, HTTPException, Request, status, Depends, Header
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import ValidationError
+from app.models import (
+    MCPInitializeRequest,
+    MCPListToolsRequest,
+    MCPToolCallRequest,
+    MCPToolCallResponse,
+    REQUEST_ID_ADAPTER,
+)
+from app.mcp.tools import TOOLS_DUMPED, TOOLS_JSON_FRAGMENT, execute_tool
+from app.oauth.token import verify_access_token_cached
 from app.config import settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+rpc_router = APIRouter(default_response_class=ORJSONResponse)
+
+# WWW-Authenticate challenges (settings are fixed at import, so build once)
+_MISSING_AUTH_HEADERS = {
+    "WWW-Authenticate": (
+        f'Bearer realm="mcp-server", '
+        f'as_uri="{settings.SERVER_URL}/.well-known/oauth-authorization-server", '
+        f'resource="{settings.SERVER_URL}"'
+    )
+}
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+# Fixed JSON-RPC error objects (shared, never mutated)
+_ERR_NAME_REQUIRED = {"code": -32602, "message": "Invalid params: 'name' is required"}
+_ERR_INVALID_REQUEST = {"code": -32600, "message": "Invalid Request"}
+_ERR_BATCH_TOO_LARGE = {
+    "code": -32600,
+    "message": f"Invalid Request: batch exceeds {settings.MCP_MAX_BATCH_SIZE} requests"
+}
+
+
+def _error(id_: Any, error: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a JSON-RPC 2.0 error response envelope."""
+    return {"jsonrpc": "2.0", "id": id_, "error": error}
 
 
-async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict[str, Any]:
+class BearerAuth:
     """
     Dependency to extract and verify the current user from Bearer token.
 
-    Args:
-        authorization: Authorization header with Bearer token
+    Verified claims are stored on request.state, so any later caller in the
+    same request (another dependency, middleware, a dispatcher) gets them
+    without re-parsing the header.
+    """
 
-    Returns:
-        Decoded token claims with user information
+    async def __call__(
+        self,
+        request: Request,
+        authorization: Optional[str] = Header(None)
+    ) -> Mapping[str, Any]:
+        """
+        Args:
+            request: Incoming request (holds cached claims on its state)
+            authorization: Authorization header with Bearer token
 
-    Raises:
-        HTTPException: If token is missing or invalid
-    """
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header",
-            headers={
-                "WWW-Authenticate": (
-                    f'Bearer realm="mcp-server", '
-                    f'as_uri="{settings.SERVER_URL}/.well-known/oauth-authorization-server", '
-                    f'resource="{settings.SERVER_URL}"'
-                )
-            }
-        )
+        Returns:
+            Decoded token claims with user information (read-only)
 
-    # Extract Bearer token
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization header format. Expected 'Bearer <token>'",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
+        Raises:
+            HTTPException: If token is missing or invalid
+        """
+        claims = getattr(request.state, "auth_claims", None)
+        if claims is not None:
+            return claims
 
-    token = parts[1]
+        if not authorization:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Missing authorization header",
+                headers=_MISSING_AUTH_HEADERS
+            )
 
-    # Verify token
-    try:
-        claims = verify_access_token(token)
+        # Extract Bearer token (any run of whitespace separates scheme and
+        # token, as RFC 6750's 1*SP allows)
+        parts = authorization.split()
+        if len(parts) != 2 or parts[0].lower() != "bearer":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authorization header format. Expected 'Bearer <token>'",
+                headers=_BEARER_HEADERS
+            )
+
+        # Verify token
+        try:
+            claims = verify_access_token_cached(parts[1])
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Token verification failed: {str(e)}",
+                headers=_BEARER_HEADERS
+            )
+
+        request.state.auth_claims = claims
         return claims
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Token verification failed: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"}
-        )
 
 
-@router.post("/mcp/initialize")
-async def initialize(request: Dict[str, Any]):
+get_current_user = BearerAuth()
+
+
+@router.post("/initialize")
+async def initialize(request: MCPInitializeRequest):
     """
     MCP initialize method.
 
@@ -86,22 +138,13 @@ async def initialize(request: Dict[str, Any]):
             "clientInfo": {...}
         }
     }
-    """
-    # Validate JSON-RPC format
-    if request.get("jsonrpc") != "2.0":
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "error": {
-                "code": -32600,
-                "message": "Invalid Request: jsonrpc must be '2.0'"
-            }
-        }
 
-    # Build response
+    A body whose jsonrpc member is not "2.0" is rejected with 422 during
+    request validation.
+    """
     return {
         "jsonrpc": "2.0",
-        "id": request.get("id"),
+        "id": request.id,
         "result": {
             "protocolVersion": "0.1.0",
             "serverInfo": {
@@ -120,9 +163,9 @@ async def initialize(request: Dict[str, Any]):
     }
 
 
-@router.post("/mcp/tools/list")
+@router.post("/tools/list")
 async def list_tools(
-    request: Dict[str, Any],
+    request: MCPListToolsRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -138,32 +181,18 @@ async def list_tools(
         "params": {}
     }
     """
-    # Validate JSON-RPC format
-    if request.get("jsonrpc") != "2.0":
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "error": {
-                "code": -32600,
-                "message": "Invalid Request: jsonrpc must be '2.0'"
-            }
-        }
-
-    # Get available tools
-    tools = get_available_tools()
-
-    return {
-        "jsonrpc": "2.0",
-        "id": request.get("id"),
-        "result": {
-            "tools": [tool.model_dump() for tool in tools]
-        }
-    }
+    # Splice the pre-serialized tool list into the envelope
+    return Response(
+        content=b'{"jsonrpc":"2.0","id":%b,"result":{"tools":%b}}' % (
+            orjson.dumps(request.id), TOOLS_JSON_FRAGMENT
+        ),
+        media_type="application/json",
+    )
 
 
-@router.post("/mcp/tools/call")
+@router.post("/tools/call")
 async def call_tool(
-    request: Dict[str, Any],
+    request: MCPToolCallRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -185,58 +214,120 @@ async def call_tool(
         }
     }
     """
-    # Validate JSON-RPC format
-    if request.get("jsonrpc") != "2.0":
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "error": {
-                "code": -32600,
-                "message": "Invalid Request: jsonrpc must be '2.0'"
-            }
-        }
-
     # Extract parameters
-    params = request.get("params", {})
+    params = request.params
     tool_name = params.get("name")
     arguments = params.get("arguments", {})
 
     if not tool_name:
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "error": {
-                "code": -32602,
-                "message": "Invalid params: 'name' is required"
-            }
-        }
+        return _error(request.id, _ERR_NAME_REQUIRED)
 
     # Get user ID from token
     user_id = current_user.get("sub", "unknown")
 
     # Execute tool
     try:
-        result = execute_tool(tool_name, arguments, user_id)
+        result = await execute_tool(tool_name, arguments, user_id)
         return {
             "jsonrpc": "2.0",
-            "id": request.get("id"),
+            "id": request.id,
             "result": result
         }
     except ValueError as e:
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "error": {
-                "code": -32601,
-                "message": f"Method not found: {str(e)}"
-            }
-        }
+        return _error(request.id, {
+            "code": -32601,
+            "message": f"Method not found: {str(e)}"
+        })
     except Exception as e:
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "error": {
-                "code": -32603,
-                "message": f"Internal error: {str(e)}"
-            }
-        }
+        return _error(request.id, {
+            "code": -32603,
+            "message": f"Internal error: {str(e)}"
+        })
+
+
+# ============================================================================
+# Single Endpoint with Batch Support
+# ============================================================================
+
+async def _rpc_initialize(item: Dict[str, Any], current_user: Dict[str, Any]) -> Dict[str, Any]:
+    return await initialize(MCPInitializeRequest.model_validate(item))
+
+
+async def _rpc_list_tools(item: Dict[str, Any], current_user: Dict[str, Any]) -> Dict[str, Any]:
+    # Batched responses are serialized as one list, so use the dumped dicts
+    request = MCPListToolsRequest.model_validate(item)
+    return {"jsonrpc": "2.0", "id": request.id, "result": {"tools": TOOLS_DUMPED}}
+
+
+async def _rpc_call_tool(item: Dict[str, Any], current_user: Dict[str, Any]) -> Dict[str, Any]:
+    return await call_tool(MCPToolCallRequest.model_validate(item), current_user)
+
+
+# JSON-RPC method name -> async handler(item, current_user)
+RPC_METHODS = {
+    "initialize": _rpc_initialize,
+    "tools/list": _rpc_list_tools,
+    "tools/call": _rpc_call_tool,
+}
+
+
+def _is_notification(item: Any) -> bool:
+    """A JSON-RPC notification is a request object without an "id" member."""
+    return isinstance(item, dict) and "id" not in item
+
+
+async def _dispatch(item: Any, current_user: Dict[str, Any]) -> Dict[str, Any]:
+    """Route one JSON-RPC request object to its method handler."""
+    if not isinstance(item, dict):
+        return _error(None, _ERR_INVALID_REQUEST)
+    try:
+        REQUEST_ID_ADAPTER.validate_python(item.get("id"))
+    except ValidationError:
+        # An id that can't be echoed back can't be answered either
+        return _error(None, _ERR_INVALID_REQUEST)
+
+    method = item.get("method")
+    handler = RPC_METHODS.get(method) if isinstance(method, str) else None
+    if handler is None:
+        return _error(item.get("id"), {
+            "code": -32601,
+            "message": f"Method not found: {method}"
+        })
+    try:
+        return await handler(item, current_user)
+    except ValidationError:
+        return _error(item.get("id"), _ERR_INVALID_REQUEST)
+
+
+@rpc_router.post("/mcp")
+async def rpc(
+    payload: Union[List[Any], Dict[str, Any]] = Body(...),
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Single MCP JSON-RPC endpoint, dispatching on the "method" member.
+
+    Accepts either one request object or a JSON-RPC 2.0 batch array of at
+    most MCP_MAX_BATCH_SIZE requests. A batch is authenticated once and its
+    requests run concurrently; responses are returned in request order.
+    Notifications (requests without an id) are executed but get no response,
+    and a call made only of notifications is answered with 202 and no body.
+    Requires authentication.
+    """
+    if isinstance(payload, dict):
+        response = await _dispatch(payload, current_user)
+        if _is_notification(payload):
+            return Response(status_code=status.HTTP_202_ACCEPTED)
+        return response
+
+    if not payload:
+        return _error(None, _ERR_INVALID_REQUEST)
+    if len(payload) > settings.MCP_MAX_BATCH_SIZE:
+        return _error(None, _ERR_BATCH_TOO_LARGE)
+
+    responses = await asyncio.gather(*(_dispatch(item, current_user) for item in payload))
+    results = [
+        response for item, response in zip(payload, responses)
+        if not _is_notification(item)
+    ]
+    return results or Response(status_code=status.HTTP_202_ACCEPTED)
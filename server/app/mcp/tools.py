@@ -4,7 +4,11 @@ Example MCP tools for demonstration.
 These tools require OAuth authentication to access.
 """
 
-from typing import Dict, Any
+import fnmatch
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Any, Optional
+import orjson
 from app.models import MCPTool, MCPToolInputSchema, MCPToolParameter
 
 
@@ -44,7 +48,10 @@ AVAILABLE_TOOLS = [
                 ),
                 "pattern": MCPToolParameter(
                     type="string",
-                    description="Optional glob pattern to filter files (e.g., '*.txt')"
+                    description=(
+                        "Optional glob pattern matched against the whole file name "
+                        "(e.g., '*.txt'; use 'doc*' rather than 'doc' for a prefix)"
+                    )
                 )
             },
             required=["path"]
@@ -66,7 +73,38 @@ AVAILABLE_TOOLS = [
 # Tool Implementations
 # ============================================================================
 
-def execute_get_weather(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+# Static mock data, shared by every call (never mutated; responses are
+# serialized straight away)
+_FORECAST = (
+    {"day": "Today", "high": 75, "low": 58, "conditions": "Partly Cloudy"},
+    {"day": "Tomorrow", "high": 78, "low": 61, "conditions": "Sunny"},
+    {"day": "Wednesday", "high": 73, "low": 59, "conditions": "Cloudy"},
+)
+
+_MOCK_FILES = (
+    {"name": "document.txt", "size": 1024, "type": "file", "modified": "2025-11-01T10:30:00Z"},
+    {"name": "reports", "size": 4096, "type": "directory", "modified": "2025-11-02T14:15:00Z"},
+    {"name": "image.png", "size": 524288, "type": "file", "modified": "2025-11-03T09:00:00Z"},
+    {"name": "data.json", "size": 2048, "type": "file", "modified": "2025-10-30T16:45:00Z"},
+    {"name": "scripts", "size": 4096, "type": "directory", "modified": "2025-10-28T11:20:00Z"},
+)
+
+_ROLES = ("user", "developer")
+
+_PREFERENCES = {
+    "theme": "dark",
+    "language": "en",
+    "timezone": "America/Los_Angeles"
+}
+
+
+@lru_cache(maxsize=256)
+def _glob_matcher(pattern: str) -> Callable[[str], Optional[re.Match]]:
+    """Compile a glob pattern once into a regex match function."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+async def execute_get_weather(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """
     Execute the get_weather tool.
 
@@ -83,11 +121,7 @@ def execute_get_weather(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         "conditions": "Partly Cloudy",
         "humidity": "65%",
         "wind_speed": "10 mph",
-        "forecast": [
-            {"day": "Today", "high": 75, "low": 58, "conditions": "Partly Cloudy"},
-            {"day": "Tomorrow", "high": 78, "low": 61, "conditions": "Sunny"},
-            {"day": "Wednesday", "high": 73, "low": 59, "conditions": "Cloudy"},
-        ]
+        "forecast": _FORECAST
     }
 
     return {
@@ -97,7 +131,7 @@ def execute_get_weather(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     }
 
 
-def execute_list_files(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+async def execute_list_files(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """
     Execute the list_files tool.
 
@@ -106,23 +140,12 @@ def execute_list_files(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     path = params.get("path")
     pattern = params.get("pattern", "*")
 
-    # Mock file data
-    mock_files = [
-        {"name": "document.txt", "size": 1024, "type": "file", "modified": "2025-11-01T10:30:00Z"},
-        {"name": "reports", "size": 4096, "type": "directory", "modified": "2025-11-02T14:15:00Z"},
-        {"name": "image.png", "size": 524288, "type": "file", "modified": "2025-11-03T09:00:00Z"},
-        {"name": "data.json", "size": 2048, "type": "file", "modified": "2025-10-30T16:45:00Z"},
-        {"name": "scripts", "size": 4096, "type": "directory", "modified": "2025-10-28T11:20:00Z"},
-    ]
-
-    # Simple pattern filtering
+    # Glob pattern filtering
     if pattern != "*":
-        filtered_files = [
-            f for f in mock_files
-            if pattern.replace("*", "") in f["name"]
-        ]
+        match = _glob_matcher(pattern)
+        filtered_files = [f for f in _MOCK_FILES if match(f["name"])]
     else:
-        filtered_files = mock_files
+        filtered_files = _MOCK_FILES
 
     return {
         "success": True,
@@ -136,7 +159,7 @@ def execute_list_files(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     }
 
 
-def execute_get_user_profile(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+async def execute_get_user_profile(params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """
     Execute the get_user_profile tool.
 
@@ -149,12 +172,8 @@ def execute_get_user_profile(params: Dict[str, Any], user_id: str) -> Dict[str,
         "email": f"{user_id}@example.com",
         "full_name": "Mock User",
         "created_at": "2025-01-01T00:00:00Z",
-        "roles": ["user", "developer"],
-        "preferences": {
-            "theme": "dark",
-            "language": "en",
-            "timezone": "America/Los_Angeles"
-        }
+        "roles": _ROLES,
+        "preferences": _PREFERENCES
     }
 
     return {
@@ -175,10 +194,13 @@ TOOL_EXECUTORS = {
 }
 
 
-def execute_tool(tool_name: str, params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+async def execute_tool(tool_name: str, params: Dict[str, Any], user_id: str) -> Dict[str, Any]:
     """
     Execute a tool by name with the given parameters.
 
+    Executors are coroutines so tools that do I/O can await it without
+    blocking the event loop; CPU-heavy tools should use asyncio.to_thread.
+
     Args:
         tool_name: Name of the tool to execute
         params: Tool parameters
@@ -190,13 +212,18 @@ def execute_tool(tool_name: str, params: Dict[str, Any], user_id: str) -> Dict[s
     Raises:
         ValueError: If tool not found
     """
-    if tool_name not in TOOL_EXECUTORS:
+    executor = TOOL_EXECUTORS.get(tool_name)
+    if executor is None:
         raise ValueError(f"Unknown tool: {tool_name}")
 
-    executor = TOOL_EXECUTORS[tool_name]
-    return executor(params, user_id)
+    return await executor(params, user_id)
 
 
 def get_available_tools() -> list[MCPTool]:
     """Get list of available MCP tools."""
     return AVAILABLE_TOOLS
+
+
+# The tool list never changes, so convert and serialize it once at import
+TOOLS_DUMPED = [tool.to_dict() for tool in AVAILABLE_TOOLS]
+TOOLS_JSON_FRAGMENT = orjson.dumps(TOOLS_DUMPED)
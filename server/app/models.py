@@ -1,9 +1,14 @@
 """
 Pydantic models for OAuth, DCR, and MCP protocol.
+
+Static MCP tool descriptors and the internal storage records are plain
+slotted dataclasses instead; they are only ever built by server code, never
+validated from request input.
 """
 
-from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
+from pydantic import BaseModel, Field, HttpUrl, StrictInt, TypeAdapter
+from typing import Optional, List, Dict, Any, Literal, Union, Annotated
 from datetime import datetime
 from enum import Enum
 
@@ -125,6 +130,7 @@ class AuthorizationServerMetadata(BaseModel):
     authorization_endpoint: str
     token_endpoint: str
     registration_endpoint: str
+    jwks_uri: Optional[str] = None
     response_types_supported: List[str]
     grant_types_supported: List[str]
     code_challenge_methods_supported: List[str]
@@ -144,31 +150,58 @@ class ProtectedResourceMetadata(BaseModel):
 # MCP Protocol Models
 # ============================================================================
 
-class MCPToolParameter(BaseModel):
+# JSON-RPC request id, echoed back verbatim. Integers are bounded to what
+# orjson can encode (64 bits), so oversized ids fail validation instead of
+# failing the response serialization
+RequestId = Union[Annotated[StrictInt, Field(ge=-2**63, lt=2**64)], str, None]
+REQUEST_ID_ADAPTER = TypeAdapter(RequestId)
+
+
+@dataclass(slots=True, frozen=True)
+class MCPToolParameter:
     """MCP tool input parameter."""
     type: str
     description: Optional[str] = None
     enum: Optional[List[str]] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": self.type, "description": self.description, "enum": self.enum}
 
-class MCPToolInputSchema(BaseModel):
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class MCPToolInputSchema:
     """MCP tool input schema (JSON Schema)."""
     type: str = "object"
     properties: Dict[str, MCPToolParameter]
     required: Optional[List[str]] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "properties": {name: param.to_dict() for name, param in self.properties.items()},
+            "required": self.required,
+        }
+
 
-class MCPTool(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MCPTool:
     """MCP tool definition."""
     name: str
     description: str
     inputSchema: MCPToolInputSchema
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "inputSchema": self.inputSchema.to_dict(),
+        }
+
 
 class MCPToolCallRequest(BaseModel):
     """MCP tool call request."""
-    jsonrpc: str = "2.0"
-    id: Any
+    jsonrpc: Literal["2.0"]
+    id: RequestId = None
     method: str = "tools/call"
     params: Dict[str, Any]
 
@@ -176,23 +209,23 @@ class MCPToolCallRequest(BaseModel):
 class MCPToolCallResponse(BaseModel):
     """MCP tool call response."""
     jsonrpc: str = "2.0"
-    id: Any
+    id: RequestId
     result: Optional[Dict[str, Any]] = None
     error: Optional[Dict[str, Any]] = None
 
 
 class MCPInitializeRequest(BaseModel):
     """MCP initialize request."""
-    jsonrpc: str = "2.0"
-    id: Any
+    jsonrpc: Literal["2.0"]
+    id: RequestId = None
     method: str = "initialize"
-    params: Dict[str, Any]
+    params: Dict[str, Any] = Field(default_factory=dict)
 
 
 class MCPListToolsRequest(BaseModel):
     """MCP list tools request."""
-    jsonrpc: str = "2.0"
-    id: Any
+    jsonrpc: Literal["2.0"]
+    id: RequestId = None
     method: str = "tools/list"
     params: Optional[Dict[str, Any]] = None
 
@@ -201,7 +234,8 @@ class MCPListToolsRequest(BaseModel):
 # Internal Storage Models
 # ============================================================================
 
-class RegisteredClient(BaseModel):
+@dataclass(slots=True)
+class RegisteredClient:
     """Internal model for registered client."""
     client_id: str
     client_secret: Optional[str]
@@ -214,7 +248,8 @@ class RegisteredClient(BaseModel):
     created_at: datetime
 
 
-class AuthorizationCode(BaseModel):
+@dataclass(slots=True)
+class AuthorizationCode:
     """Internal model for authorization code."""
     code: str
     client_id: str
@@ -223,15 +258,16 @@ class AuthorizationCode(BaseModel):
     code_challenge: str
     code_challenge_method: CodeChallengeMethod
     user_id: str  # Mock user
-    expires_at: datetime
+    expires_at: float  # time.monotonic() deadline
     used: bool = False
 
 
-class RefreshToken(BaseModel):
+@dataclass(slots=True)
+class RefreshToken:
     """Internal model for refresh token."""
     token: str
     client_id: str
     user_id: str
     scope: Optional[str]
-    expires_at: datetime
+    expires_at: float  # time.monotonic() deadline
     revoked: bool = False
@@ -2,23 +2,25 @@
 OAuth 2.0 Authorization Endpoint with PKCE support.
 """
 
-import secrets
-from datetime import datetime, timedelta
+import html
+import time
 from fastapi import APIRouter, HTTPException, status, Request
 from fastapi.responses import RedirectResponse, HTMLResponse
-from app.models import (
-    AuthorizationCode,
-    CodeChallengeMethod
-)
+from app.models import AuthorizationCode
 from app.storage import storage
 from app.config import settings
+from app.oauth.entropy import token_urlsafe
+from app.oauth.pkce import CHALLENGE_METHODS
 
 router = APIRouter()
 
+# Authorization code lifetime in seconds (settings are fixed at import)
+_CODE_TTL_SEC = settings.OAUTH_AUTHORIZATION_CODE_EXPIRE_MINUTES * 60
+
 
 def generate_authorization_code() -> str:
     """Generate a secure authorization code."""
-    return secrets.token_urlsafe(32)
+    return token_urlsafe(32)
 
 
 @router.get("/oauth/authorize")
@@ -79,9 +81,8 @@ async def authorize(
             detail="code_challenge is required"
         )
 
-    try:
-        challenge_method = CodeChallengeMethod(code_challenge_method)
-    except ValueError:
+    challenge_method = CHALLENGE_METHODS.get(code_challenge_method)
+    if challenge_method is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported code_challenge_method: {code_challenge_method}"
@@ -99,9 +100,7 @@ async def authorize(
         code_challenge=code_challenge,
         code_challenge_method=challenge_method,
         user_id="mock_user_123",  # Mock user ID
-        expires_at=datetime.utcnow() + timedelta(
-            minutes=settings.OAUTH_AUTHORIZATION_CODE_EXPIRE_MINUTES
-        ),
+        expires_at=time.monotonic() + _CODE_TTL_SEC,
         used=False
     )
     storage.store_authorization_code(auth_code)
@@ -114,6 +113,71 @@ async def authorize(
     return RedirectResponse(url=redirect_url)
 
 
+# Consent page markup; only the application name and scopes vary, so the
+# page is split once into pre-encoded byte segments around those two slots
+_CONSENT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Authorization Request</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 600px;
+            margin: 50px auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        h1 { color: #333; }
+        .info { margin: 20px 0; }
+        .scope {
+            background-color: #e3f2fd;
+            padding: 10px;
+            border-radius: 4px;
+            margin: 10px 0;
+        }
+        button {
+            background-color: #4CAF50;
+            color: white;
+            padding: 12px 24px;
+            border: none;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 16px;
+        }
+        button:hover {
+            background-color: #45a049;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Authorization Request</h1>
+        <div class="info">
+            <p><strong>Application:</strong> $name</p>
+            <p><strong>Requested Scopes:</strong></p>
+            <div class="scope">$scopes</div>
+        </div>
+        <p>This application is requesting access to your MCP resources.</p>
+        <p><em>Note: This is a mock server - authorization is automatically approved.</em></p>
+        <button onclick="window.close()">Approve</button>
+    </div>
+</body>
+</html>
+"""
+
+_head, _, _rest = _CONSENT_TEMPLATE.partition("$name")
+_mid, _, _tail = _rest.partition("$scopes")
+_CONSENT_HEAD, _CONSENT_MID, _CONSENT_TAIL = (
+    part.encode("utf-8") for part in (_head, _mid, _tail)
+)
+
+
 @router.get("/oauth/consent")
 async def consent_page(
     client_id: str,
@@ -133,61 +197,10 @@ async def consent_page(
             detail="Invalid client_id"
         )
 
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Authorization Request</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                max-width: 600px;
-                margin: 50px auto;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }}
-            .container {{
-                background-color: white;
-                padding: 30px;
-                border-radius: 8px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            h1 {{ color: #333; }}
-            .info {{ margin: 20px 0; }}
-            .scope {{
-                background-color: #e3f2fd;
-                padding: 10px;
-                border-radius: 4px;
-                margin: 10px 0;
-            }}
-            button {{
-                background-color: #4CAF50;
-                color: white;
-                padding: 12px 24px;
-                border: none;
-                border-radius: 4px;
-                cursor: pointer;
-                font-size: 16px;
-            }}
-            button:hover {{
-                background-color: #45a049;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Authorization Request</h1>
-            <div class="info">
-                <p><strong>Application:</strong> {client.client_name or client_id}</p>
-                <p><strong>Requested Scopes:</strong></p>
-                <div class="scope">{scope or client.scope or "Default scopes"}</div>
-            </div>
-            <p>This application is requesting access to your MCP resources.</p>
-            <p><em>Note: This is a mock server - authorization is automatically approved.</em></p>
-            <button onclick="window.close()">Approve</button>
-        </div>
-    </body>
-    </html>
-    """
+    # Escape the client-controlled values before splicing them into HTML
+    name = html.escape(client.client_name or client_id).encode("utf-8")
+    scopes = html.escape(scope or client.scope or "Default scopes").encode("utf-8")
 
-    return HTMLResponse(content=html_content)
+    return HTMLResponse(
+        content=b"".join((_CONSENT_HEAD, name, _CONSENT_MID, scopes, _CONSENT_TAIL))
+    )
@@ -2,10 +2,9 @@
 Dynamic Client Registration (RFC 7591) implementation.
 """
 
-import uuid
-import secrets
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from app.models import (
     ClientRegistrationRequest,
     ClientRegistrationResponse,
@@ -13,18 +12,19 @@ from app.models import (
 )
 from app.storage import storage
 from app.config import settings
+from app.oauth.entropy import token_bytes, token_urlsafe
 
 router = APIRouter()
 
 
 def generate_client_id() -> str:
-    """Generate a unique client ID."""
-    return f"client_{uuid.uuid4().hex}"
+    """Generate a unique client ID (128 random bits, same shape as a uuid4 hex)."""
+    return f"client_{token_bytes(16).hex()}"
 
 
 def generate_client_secret() -> str:
     """Generate a secure client secret."""
-    return secrets.token_urlsafe(32)
+    return token_urlsafe(32)
 
 
 @router.post("/oauth/register", response_model=ClientRegistrationResponse)
@@ -85,4 +85,5 @@ async def register_client(request: ClientRegistrationRequest):
         registration_access_token=None
     )
 
-    return response
+    # Already validated by the model; skip FastAPI's re-validation/encoding
+    return ORJSONResponse(content=response.model_dump())
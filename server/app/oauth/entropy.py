@@ -0,0 +1,57 @@
+"""
+Pooled CSPRNG output for minting opaque OAuth tokens.
+
+os.urandom costs one getrandom() syscall per call. Codes, refresh tokens and
+client secrets are instead sliced from a shared pool refilled 8 KB at a time.
+Every byte handed out is used exactly once, and the pool is dropped in forked
+children so two processes never issue the same token.
+"""
+
+import base64
+import os
+import threading
+
+_POOL_SIZE = 8192
+
+_lock = threading.Lock()
+_pool = b""
+_pos = 0
+
+
+def _reset_pool() -> None:
+    """Discard the pool (after fork, the child must not reuse parent bytes)."""
+    global _lock, _pool, _pos
+    _lock = threading.Lock()
+    _pool = b""
+    _pos = 0
+
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+def token_bytes(nbytes: int = 32) -> bytes:
+    """
+    Return nbytes of cryptographically secure random data from the pool.
+
+    Args:
+        nbytes: Number of random bytes; requests larger than the pool go
+            straight to os.urandom
+
+    Returns:
+        Random bytes, never handed out before
+    """
+    global _pool, _pos
+    if nbytes > _POOL_SIZE:
+        return os.urandom(nbytes)
+    with _lock:
+        if _pos + nbytes > len(_pool):
+            _pool = os.urandom(_POOL_SIZE)
+            _pos = 0
+        chunk = _pool[_pos:_pos + nbytes]
+        _pos += nbytes
+    return chunk
+
+
+def token_urlsafe(nbytes: int = 32) -> str:
+    """Pooled equivalent of secrets.token_urlsafe(nbytes)."""
+    return base64.urlsafe_b64encode(token_bytes(nbytes)).rstrip(b"=").decode("ascii")
@@ -3,44 +3,78 @@ OAuth Authorization Server Metadata (RFC 8414) and
 OAuth Protected Resource Metadata (RFC 9728) endpoints.
 """
 
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse, Response
 from app.models import AuthorizationServerMetadata, ProtectedResourceMetadata
 from app.config import settings
+from app.oauth.token import public_jwks
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
-@router.get("/.well-known/oauth-authorization-server")
-async def authorization_server_metadata() -> AuthorizationServerMetadata:
+# Metadata depends only on settings fixed at startup, so serialize it once
+_AS_METADATA_JSON = orjson.dumps(AuthorizationServerMetadata(
+    issuer=settings.SERVER_URL,
+    authorization_endpoint=f"{settings.SERVER_URL}/oauth/authorize",
+    token_endpoint=f"{settings.SERVER_URL}/oauth/token",
+    registration_endpoint=f"{settings.SERVER_URL}/oauth/register",
+    # Only EdDSA tokens can be verified with a published key; with HS256 the
+    # key set is empty, so there is nothing to advertise
+    jwks_uri=(
+        f"{settings.SERVER_URL}/.well-known/jwks.json"
+        if settings.JWT_ALGORITHM == "EdDSA" else None
+    ),
+    response_types_supported=["code"],
+    grant_types_supported=["authorization_code", "refresh_token"],
+    code_challenge_methods_supported=["S256"],
+    token_endpoint_auth_methods_supported=["none", "client_secret_post"],
+    scopes_supported=["mcp:tools:read", "mcp:tools:execute"],
+).model_dump(exclude_none=True))
+
+_PR_METADATA_JSON = orjson.dumps(ProtectedResourceMetadata(
+    resource=settings.SERVER_URL,
+    authorization_servers=[settings.SERVER_URL],
+    scopes_supported=["mcp:tools:read", "mcp:tools:execute"],
+    bearer_methods_supported=["header"],
+).model_dump())
+
+_JWKS_JSON = orjson.dumps(public_jwks())
+
+
+@router.get(
+    "/.well-known/oauth-authorization-server",
+    response_model=AuthorizationServerMetadata
+)
+async def authorization_server_metadata():
     """
     OAuth 2.0 Authorization Server Metadata endpoint (RFC 8414).
 
     Provides server capabilities and endpoint locations for client discovery.
     """
-    return AuthorizationServerMetadata(
-        issuer=settings.SERVER_URL,
-        authorization_endpoint=f"{settings.SERVER_URL}/oauth/authorize",
-        token_endpoint=f"{settings.SERVER_URL}/oauth/token",
-        registration_endpoint=f"{settings.SERVER_URL}/oauth/register",
-        response_types_supported=["code"],
-        grant_types_supported=["authorization_code", "refresh_token"],
-        code_challenge_methods_supported=["S256"],
-        token_endpoint_auth_methods_supported=["none", "client_secret_post"],
-        scopes_supported=["mcp:tools:read", "mcp:tools:execute"],
-    )
-
-
-@router.get("/.well-known/oauth-protected-resource")
-async def protected_resource_metadata() -> ProtectedResourceMetadata:
+    return Response(content=_AS_METADATA_JSON, media_type="application/json")
+
+
+@router.get(
+    "/.well-known/oauth-protected-resource",
+    response_model=ProtectedResourceMetadata
+)
+async def protected_resource_metadata():
     """
     OAuth 2.0 Protected Resource Metadata endpoint (RFC 9728).
 
     Indicates the location of authorization servers and supported scopes.
     This is critical for MCP clients to discover how to authenticate.
     """
-    return ProtectedResourceMetadata(
-        resource=settings.SERVER_URL,
-        authorization_servers=[settings.SERVER_URL],
-        scopes_supported=["mcp:tools:read", "mcp:tools:execute"],
-        bearer_methods_supported=["header"],
-    )
+    return Response(content=_PR_METADATA_JSON, media_type="application/json")
+
+
+@router.get("/.well-known/jwks.json")
+async def jwks():
+    """
+    JSON Web Key Set (RFC 7517) with the access-token verification key.
+
+    Lets resource servers and clients verify EdDSA tokens offline; empty when
+    tokens are HS256-signed with a shared secret.
+    """
+    return Response(content=_JWKS_JSON, media_type="application/json")
@@ -9,6 +9,16 @@ import base64
 import secrets
 from app.models import CodeChallengeMethod
 
+# Enum members bound once; verification compares by identity (members are
+# singletons) instead of an enum attribute lookup plus str equality per call
+_S256 = CodeChallengeMethod.S256
+_PLAIN = CodeChallengeMethod.PLAIN
+
+# Method name -> member; str-enum members hash like their values, so this
+# normalizes both members and plain strings such as "S256" in one lookup.
+# authorize.py validates code_challenge_method against it as well
+CHALLENGE_METHODS = {method.value: method for method in CodeChallengeMethod}
+
 
 def generate_code_verifier(length: int = 64) -> str:
     """
@@ -72,7 +82,7 @@ def verify_code_challenge(
     Args:
         code_verifier: The code verifier from token request
         code_challenge: The stored code challenge from authorization request
-        method: The challenge method used
+        method: The challenge method used (member or its string value)
 
     Returns:
         True if the verifier matches the challenge, False otherwise
@@ -80,9 +90,16 @@ def verify_code_challenge(
     Note:
         Uses constant-time comparison to prevent timing attacks.
     """
-    try:
-        expected_challenge = generate_code_challenge(code_verifier, method)
-        # Use constant-time comparison to prevent timing attacks
-        return secrets.compare_digest(expected_challenge, code_challenge)
-    except Exception:
+    # Work in bytes end to end: the base64 output is compared as-is, with no
+    # str decode, and bytes comparison cannot raise on non-ASCII input
+    method = CHALLENGE_METHODS.get(method)
+    if method is _S256:
+        digest = hashlib.sha256(code_verifier.encode('utf-8')).digest()
+        expected = base64.urlsafe_b64encode(digest).rstrip(b'=')
+    elif method is _PLAIN:
+        expected = code_verifier.encode('utf-8')
+    else:
         return False
+
+    # Use constant-time comparison to prevent timing attacks
+    return secrets.compare_digest(expected, code_challenge.encode('utf-8'))
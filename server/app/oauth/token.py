@@ -2,11 +2,21 @@
 OAuth 2.0 Token Endpoint with PKCE validation and refresh token support.
 """
 
-import secrets
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import base64
+import hashlib
+import hmac
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+import orjson
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
 from fastapi import APIRouter, HTTPException, status, Form
+from fastapi.responses import ORJSONResponse
 from jose import jwt, JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
 from app.models import (
     TokenResponse,
     RefreshToken,
@@ -15,13 +25,59 @@ from app.models import (
 from app.storage import storage
 from app.config import settings
 from app.oauth.pkce import verify_code_challenge
+from app.oauth.entropy import token_urlsafe
 
 router = APIRouter()
 
+# Challenge header for rejected access tokens (shared, never mutated)
+_BEARER_HEADERS = {"WWW-Authenticate": "Bearer"}
+
+# grant_type values bound once (skips two enum attribute loads per request)
+_GRANT_AUTHORIZATION_CODE = GrantType.AUTHORIZATION_CODE.value
+_GRANT_REFRESH_TOKEN = GrantType.REFRESH_TOKEN.value
+
+# Lifetimes in seconds (settings are fixed at import)
+_ACCESS_TTL_SEC = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TTL_SEC = settings.OAUTH_REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+
+def _equals(a: str, b: str) -> bool:
+    """Constant-time string equality (bytes, so non-ASCII input cannot raise)."""
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWS requires."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# HS256 signing material; the JOSE header never changes, so encode it once
+_HS256_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_HS256_KEY = settings.JWT_SECRET_KEY.encode("utf-8")
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode unpadded base64url."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+# EdDSA (Ed25519) signing material, used when JWT_ALGORITHM is "EdDSA".
+# Without a configured seed an ephemeral key is generated, so tokens (like
+# the in-memory storage) do not survive a restart.
+_EDDSA_HEADER_B64 = _b64url(b'{"alg":"EdDSA","typ":"JWT"}')
+_ED25519_KEY: Optional[Ed25519PrivateKey] = None
+if settings.JWT_ALGORITHM == "EdDSA":
+    _ED25519_KEY = (
+        Ed25519PrivateKey.from_private_bytes(_b64url_decode(settings.JWT_ED25519_PRIVATE_KEY))
+        if settings.JWT_ED25519_PRIVATE_KEY
+        else Ed25519PrivateKey.generate()
+    )
+    _ED25519_PUBLIC_KEY = _ED25519_KEY.public_key()
+
 
 def generate_refresh_token() -> str:
     """Generate a secure refresh token."""
-    return secrets.token_urlsafe(32)
+    return token_urlsafe(32)
 
 
 def create_access_token(
@@ -40,28 +96,93 @@ def create_access_token(
     Returns:
         Tuple of (token, expires_in_seconds)
     """
-    expires_in = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    expires_at = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+    expires_in = _ACCESS_TTL_SEC
+    issued_at = int(time.time())
 
     claims = {
         "sub": user_id,
         "client_id": client_id,
         "scope": scope or "",
-        "exp": expires_at,
-        "iat": datetime.utcnow(),
+        "exp": issued_at + expires_in,
+        "iat": issued_at,
         "iss": settings.SERVER_URL,
         "aud": settings.SERVER_URL
     }
 
-    token = jwt.encode(
-        claims,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM
-    )
+    if _ED25519_KEY is not None:
+        signing_input = _EDDSA_HEADER_B64 + b"." + _b64url(orjson.dumps(claims))
+        signature = _ED25519_KEY.sign(signing_input)
+        return (signing_input + b"." + _b64url(signature)).decode("ascii"), expires_in
+
+    if settings.JWT_ALGORITHM != "HS256":
+        token = jwt.encode(
+            claims,
+            settings.JWT_SECRET_KEY,
+            algorithm=settings.JWT_ALGORITHM
+        )
+        return token, expires_in
+
+    # HS256 fast path: sign the compact JWS directly with the cached header
+    signing_input = _HS256_HEADER_B64 + b"." + _b64url(orjson.dumps(claims))
+    signature = hmac.new(_HS256_KEY, signing_input, hashlib.sha256).digest()
+    token = (signing_input + b"." + _b64url(signature)).decode("ascii")
 
     return token, expires_in
 
 
+def _decode_eddsa(token: str) -> Dict[str, Any]:
+    """
+    Verify an EdDSA-signed JWT (python-jose has no EdDSA support).
+
+    Checks the same things jwt.decode does for this server: signature,
+    algorithm, expiry and audience.
+
+    Raises:
+        JWTError: If the token is malformed, forged, expired or for another audience
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        _ED25519_PUBLIC_KEY.verify(
+            _b64url_decode(signature_b64),
+            f"{header_b64}.{payload_b64}".encode("ascii")
+        )
+        header = orjson.loads(_b64url_decode(header_b64))
+        claims = orjson.loads(_b64url_decode(payload_b64))
+    except (ValueError, InvalidSignature):
+        raise JWTError("Signature verification failed.")
+
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        raise JWTError("Invalid token header or payload.")
+    if header.get("alg") != "EdDSA":
+        raise JWTError("The specified alg value is not allowed")
+    if not isinstance(claims.get("exp"), int) or claims["exp"] <= time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+    if claims.get("aud") != settings.SERVER_URL:
+        raise JWTClaimsError("Invalid audience")
+    return claims
+
+
+def public_jwks() -> Dict[str, Any]:
+    """
+    JSON Web Key Set for verifying access tokens without the server.
+
+    Only EdDSA keys are published; an HS256 secret must never be, so the set
+    is empty in that mode.
+    """
+    if _ED25519_KEY is None:
+        return {"keys": []}
+    x = _ED25519_PUBLIC_KEY.public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return {
+        "keys": [{
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "alg": "EdDSA",
+            "use": "sig",
+            "x": _b64url(x).decode("ascii"),
+        }]
+    }
+
+
 def verify_access_token(token: str) -> Dict[str, Any]:
     """
     Verify and decode a JWT access token.
@@ -76,6 +197,8 @@ def verify_access_token(token: str) -> Dict[str, Any]:
         HTTPException: If token is invalid or expired
     """
     try:
+        if _ED25519_KEY is not None:
+            return _decode_eddsa(token)
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
@@ -87,10 +210,45 @@ def verify_access_token(token: str) -> Dict[str, Any]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"}
+            headers=_BEARER_HEADERS
         )
 
 
+@lru_cache(maxsize=4096)
+def _verified_claims(token: str) -> Mapping[str, Any]:
+    """
+    Verify a token once; failures raise and are never cached.
+
+    Every request with the token gets this same object, so it is a read-only
+    view: a handler mutating its claims can't corrupt the cache.
+    """
+    return MappingProxyType(verify_access_token(token))
+
+
+def verify_access_token_cached(token: str) -> Mapping[str, Any]:
+    """
+    Verify a JWT access token, reusing an earlier verification of it.
+
+    Clients send the same token on every MCP call until it expires, so the
+    signature check and claims parse only run on first sight. Cached claims
+    are returned only while the token is unexpired; after that the token is
+    re-verified, which rejects it.
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        Decoded token claims (read-only; copy with dict() to modify)
+
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    claims = _verified_claims(token)
+    if claims["exp"] > time.time():
+        return claims
+    return verify_access_token(token)
+
+
 @router.post("/oauth/token", response_model=TokenResponse)
 async def token_endpoint(
     grant_type: str = Form(...),
@@ -133,14 +291,14 @@ async def token_endpoint(
     # The code_verifier serves as proof of client identity
     if client_secret is not None:
         # If client_secret was provided in request, it must match
-        if client.client_secret != client_secret:
+        if client.client_secret is None or not _equals(client.client_secret, client_secret):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid client credentials"
             )
 
     # Handle authorization_code grant
-    if grant_type == GrantType.AUTHORIZATION_CODE.value:
+    if grant_type == _GRANT_AUTHORIZATION_CODE:
         if not code or not redirect_uri or not code_verifier:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -156,14 +314,14 @@ async def token_endpoint(
             )
 
         # Validate client ID
-        if auth_code.client_id != client_id:
+        if not _equals(auth_code.client_id, client_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Authorization code was issued to different client"
             )
 
         # Validate redirect URI
-        if auth_code.redirect_uri != redirect_uri:
+        if not _equals(auth_code.redirect_uri, redirect_uri):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Redirect URI mismatch"
@@ -202,23 +360,21 @@ async def token_endpoint(
             client_id=client_id,
             user_id=auth_code.user_id,
             scope=auth_code.scope,
-            expires_at=datetime.utcnow() + timedelta(
-                days=settings.OAUTH_REFRESH_TOKEN_EXPIRE_DAYS
-            ),
+            expires_at=time.monotonic() + _REFRESH_TTL_SEC,
             revoked=False
         )
         storage.store_refresh_token(refresh_token_obj)
 
-        return TokenResponse(
+        return ORJSONResponse(content=TokenResponse(
             access_token=access_token,
             token_type="Bearer",
             expires_in=expires_in,
             refresh_token=refresh_token_value,
             scope=auth_code.scope
-        )
+        ).model_dump())
 
     # Handle refresh_token grant
-    elif grant_type == GrantType.REFRESH_TOKEN.value:
+    elif grant_type == _GRANT_REFRESH_TOKEN:
         if not refresh_token:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -234,7 +390,7 @@ async def token_endpoint(
             )
 
         # Validate client ID
-        if refresh_token_obj.client_id != client_id:
+        if not _equals(refresh_token_obj.client_id, client_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Refresh token was issued to different client"
@@ -247,13 +403,13 @@ async def token_endpoint(
             scope=refresh_token_obj.scope
         )
 
-        return TokenResponse(
+        return ORJSONResponse(content=TokenResponse(
             access_token=access_token,
             token_type="Bearer",
             expires_in=expires_in,
             refresh_token=refresh_token,  # Return same refresh token
             scope=refresh_token_obj.scope
-        )
+        ).model_dump())
 
     else:
         raise HTTPException(
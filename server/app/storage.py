@@ -5,8 +5,11 @@ NOTE: This is for development/testing only. Production implementations
 should use a proper database with persistence.
 """
 
-from typing import Dict, Optional
-from datetime import datetime
+import heapq
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from app.models import RegisteredClient, AuthorizationCode, RefreshToken
 
 
@@ -18,12 +21,21 @@ class InMemoryStorage:
         self.authorization_codes: Dict[str, AuthorizationCode] = {}
         self.refresh_tokens: Dict[str, RefreshToken] = {}
 
+        # (expires_at, key) min-heaps so cleanup only touches expired entries
+        self._code_expiry_heap: List[Tuple[float, str]] = []
+        self._token_expiry_heap: List[Tuple[float, str]] = []
+
+        # Striped locks for the code check-and-set; 32 stripes keep contention
+        # negligible while staying atomic without the GIL (free-threaded builds)
+        self._code_locks = tuple(threading.Lock() for _ in range(32))
+
     # ========================================================================
     # Client Management
     # ========================================================================
 
     def store_client(self, client: RegisteredClient) -> None:
         """Store a registered client."""
+        client.client_id = sys.intern(client.client_id)
         self.clients[client.client_id] = client
 
     def get_client(self, client_id: str) -> Optional[RegisteredClient]:
@@ -34,13 +46,32 @@ class InMemoryStorage:
         """Check if client exists."""
         return client_id in self.clients
 
+    def _shared_scope(self, client_id: str, scope: Optional[str]) -> Optional[str]:
+        """
+        Reuse the registered client's scope string when the request matches it.
+
+        Scope is free-form client input, so it is never interned (interned
+        strings are immortal on CPython 3.12+); only a value equal to the
+        registered scope is swapped for that already-stored copy.
+        """
+        client = self.clients.get(client_id)
+        if client is not None and scope is not None and scope == client.scope:
+            return client.scope
+        return scope
+
     # ========================================================================
     # Authorization Code Management
     # ========================================================================
 
     def store_authorization_code(self, auth_code: AuthorizationCode) -> None:
         """Store an authorization code."""
+        # Intern the per-client strings: thousands of outstanding codes then
+        # share one copy each, and equality checks hit the identity fast path
+        auth_code.client_id = sys.intern(auth_code.client_id)
+        auth_code.redirect_uri = sys.intern(auth_code.redirect_uri)
+        auth_code.scope = self._shared_scope(auth_code.client_id, auth_code.scope)
         self.authorization_codes[auth_code.code] = auth_code
+        heapq.heappush(self._code_expiry_heap, (auth_code.expires_at, auth_code.code))
 
     def get_authorization_code(self, code: str) -> Optional[AuthorizationCode]:
         """Retrieve an authorization code."""
@@ -49,7 +80,7 @@ class InMemoryStorage:
             return None
 
         # Check if expired
-        if datetime.utcnow() > auth_code.expires_at:
+        if time.monotonic() > auth_code.expires_at:
             return None
 
         # Check if already used
@@ -69,39 +100,38 @@ class InMemoryStorage:
         This method provides atomic check-and-set to prevent race conditions
         where multiple concurrent requests could reuse the same code.
         """
-        auth_code = self.authorization_codes.get(code)
+        with self._code_locks[hash(code) & 31]:
+            auth_code = self.authorization_codes.get(code)
 
-        if not auth_code:
-            return False
+            if not auth_code:
+                return False
 
-        # Check if already used
-        if auth_code.used:
-            return False
+            # Check if already used
+            if auth_code.used:
+                return False
 
-        # Check if expired
-        if datetime.utcnow() > auth_code.expires_at:
-            return False
+            # Check if expired
+            if time.monotonic() > auth_code.expires_at:
+                return False
 
-        # Atomically mark as used
-        auth_code.used = True
-        return True
+            # Atomically mark as used
+            auth_code.used = True
+            return True
 
     def cleanup_expired_codes(self) -> None:
         """Remove expired authorization codes."""
-        now = datetime.utcnow()
-        self.authorization_codes = {
-            code: auth_code
-            for code, auth_code in self.authorization_codes.items()
-            if auth_code.expires_at > now
-        }
+        self._evict_expired(self._code_expiry_heap, self.authorization_codes)
 
     # ========================================================================
     # Refresh Token Management
     # ========================================================================
 
     def store_refresh_token(self, refresh_token: RefreshToken) -> None:
-        """Store a refresh token."""
+        """Store a refresh token (per-client strings shared as for codes)."""
+        refresh_token.client_id = sys.intern(refresh_token.client_id)
+        refresh_token.scope = self._shared_scope(refresh_token.client_id, refresh_token.scope)
         self.refresh_tokens[refresh_token.token] = refresh_token
+        heapq.heappush(self._token_expiry_heap, (refresh_token.expires_at, refresh_token.token))
 
     def get_refresh_token(self, token: str) -> Optional[RefreshToken]:
         """Retrieve a refresh token."""
@@ -110,7 +140,7 @@ class InMemoryStorage:
             return None
 
         # Check if expired
-        if datetime.utcnow() > refresh_token.expires_at:
+        if time.monotonic() > refresh_token.expires_at:
             return None
 
         # Check if revoked
@@ -126,17 +156,27 @@ class InMemoryStorage:
 
     def cleanup_expired_tokens(self) -> None:
         """Remove expired refresh tokens."""
-        now = datetime.utcnow()
-        self.refresh_tokens = {
-            token: refresh_token
-            for token, refresh_token in self.refresh_tokens.items()
-            if refresh_token.expires_at > now
-        }
+        self._evict_expired(self._token_expiry_heap, self.refresh_tokens)
 
     # ========================================================================
     # Utility Methods
     # ========================================================================
 
+    @staticmethod
+    def _evict_expired(heap: List[Tuple[float, str]], entries: Dict[str, object]) -> None:
+        """
+        Pop expired heap entries and delete them from the matching dict.
+
+        Costs O(k log n) for k expired entries instead of a full scan. A heap
+        entry is stale if its key was removed or re-stored with a new expiry.
+        """
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = entries.get(key)
+            if entry is not None and entry.expires_at == expires_at:
+                del entries[key]
+
     def cleanup_all(self) -> None:
         """Clean up all expired entities."""
         self.cleanup_expired_codes()
@@ -147,6 +187,8 @@ class InMemoryStorage:
         self.clients.clear()
         self.authorization_codes.clear()
         self.refresh_tokens.clear()
+        self._code_expiry_heap.clear()
+        self._token_expiry_heap.clear()
 
 
 # Global storage instance
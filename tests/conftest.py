@@ -3,8 +3,15 @@ Pytest configuration and fixtures for MCP OAuth DCR tests.
 """
 import pytest
 import httpx
+import socket
 import time
+from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, Any
+from urllib.parse import parse_qs, urlsplit
+
+# Registration redirect URIs shared by every test client (never mutated)
+_REDIRECT_URIS = ["http://localhost:3000/callback"]
 
 
 @pytest.fixture(scope="session")
@@ -14,43 +21,72 @@ def server_url():
 
 
 @pytest.fixture(scope="session")
-def server_health_check(server_url):
+def server_health_check(server_url, http_client):
     """
     Verify server is running before tests.
     Fails fast if server is not accessible.
     """
+    unreachable = (
+        f"Server not accessible at {server_url}. "
+        "Please start the server: cd server && docker-compose up"
+    )
+    url = urlsplit(server_url)
+    address = (url.hostname, url.port or 80)
+
+    # TCP connect first: a refused port fails in well under a millisecond,
+    # so a server that is down is reported without waiting on HTTP retries
     max_attempts = 3
     for attempt in range(max_attempts):
         try:
-            response = httpx.get(f"{server_url}/health", timeout=2.0)
-            if response.status_code == 200:
-                return True
-        except Exception:
+            socket.create_connection(address, timeout=0.2).close()
+            break
+        except OSError:
             if attempt < max_attempts - 1:
-                time.sleep(1)
-            else:
-                pytest.fail(
-                    f"Server not accessible at {server_url}. "
-                    "Please start the server: cd server && docker-compose up"
-                )
-    return False
+                time.sleep(0.3)
+    else:
+        pytest.fail(unreachable)
+
+    # The port is open; one HTTP request confirms the app itself is healthy
+    # (and opens the shared client's first pooled connection)
+    try:
+        return http_client.get("/health", timeout=2.0).status_code == 200
+    except httpx.HTTPError:
+        pytest.fail(unreachable)
+
+
+@pytest.fixture(scope="session")
+def client_source():
+    """Source text of client.py, read once for source-level regression checks."""
+    return (Path(__file__).parent.parent / "client.py").read_text()
 
 
-@pytest.fixture
-def client_factory(server_url):
+@pytest.fixture(scope="session")
+def http_client(server_url):
+    """
+    Shared HTTP client for the whole test session.
+    Connections are pooled and kept alive, so only the first request to the
+    server pays for the TCP handshake.
+    """
+    with httpx.Client(
+        base_url=server_url,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def client_factory(http_client):
     """
     Factory for creating test OAuth clients.
-    Returns a function that registers a new client.
+    Returns a function that registers a new client (stateless, so one
+    factory serves the whole session; each call still registers a new client).
     """
     def create_client(client_name: str = "Test Client") -> Dict[str, Any]:
         """Register a new OAuth client and return credentials."""
-        response = httpx.post(
-            f"{server_url}/oauth/register",
-            json={
-                "redirect_uris": ["http://localhost:3000/callback"],
-                "client_name": client_name,
-            },
-            timeout=5.0
+        response = http_client.post(
+            "/oauth/register",
+            json={"redirect_uris": _REDIRECT_URIS, "client_name": client_name}
         )
         response.raise_for_status()
         return response.json()
@@ -58,30 +94,32 @@ def client_factory(server_url):
     return create_client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pkce_params():
-    """Generate PKCE code verifier and challenge for testing."""
+    """
+    Generate PKCE code verifier and challenge for testing.
+    Computed once per session and returned read-only; each authorization
+    code stores its own copy of the challenge, so sharing the pair is safe.
+    """
     import base64
     import hashlib
     import secrets
 
-    verifier = base64.urlsafe_b64encode(
-        secrets.token_bytes(32)
-    ).decode('utf-8').rstrip('=')
+    verifier = secrets.token_urlsafe(32)
 
     challenge = base64.urlsafe_b64encode(
-        hashlib.sha256(verifier.encode('utf-8')).digest()
-    ).decode('utf-8').rstrip('=')
+        hashlib.sha256(verifier.encode('ascii')).digest()
+    ).rstrip(b'=').decode('ascii')
 
-    return {
+    return MappingProxyType({
         "verifier": verifier,
         "challenge": challenge,
         "method": "S256"
-    }
+    })
 
 
-@pytest.fixture
-def auth_code_factory(server_url, client_factory, pkce_params):
+@pytest.fixture(scope="session")
+def auth_code_factory(http_client, client_factory, pkce_params):
     """
     Factory for obtaining authorization codes.
     Returns a function that gets an auth code for a client.
@@ -96,7 +134,7 @@ def auth_code_factory(server_url, client_factory, pkce_params):
 
         # Request authorization (auto-approved by mock server)
         auth_url = (
-            f"{server_url}/oauth/authorize"
+            f"/oauth/authorize"
             f"?response_type=code"
             f"&client_id={client_id}"
             f"&redirect_uri=http://localhost:3000/callback"
@@ -105,13 +143,11 @@ def auth_code_factory(server_url, client_factory, pkce_params):
             f"&scope=mcp:tools:read"
         )
 
-        response = httpx.get(auth_url, follow_redirects=False, timeout=5.0)
+        response = http_client.get(auth_url, follow_redirects=False)
 
-        # Extract code from redirect
+        # Extract code from redirect (parse_qs also undoes any percent-encoding)
         location = response.headers.get("location", "")
-        code = None
-        if "code=" in location:
-            code = location.split("code=")[1].split("&")[0]
+        code = parse_qs(urlsplit(location).query).get("code", [None])[0]
 
         return {
             "code": code,
@@ -0,0 +1,107 @@
+"""
+Unit tests for the EdDSA (Ed25519) access-token signer and verifier.
+
+python-jose has no EdDSA support, so token.py signs and verifies these tokens
+itself; these tests pin down that it rejects everything jwt.decode would.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import orjson
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from fastapi import HTTPException
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "server"))
+
+from app.config import settings  # noqa: E402
+from app.oauth import token  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    """Switch token.py into EdDSA mode with a fresh key for one test."""
+    key = Ed25519PrivateKey.generate()
+    monkeypatch.setattr(token, "_ED25519_KEY", key)
+    monkeypatch.setattr(token, "_ED25519_PUBLIC_KEY", key.public_key(), raising=False)
+    return key
+
+
+def _sign(key, header, claims) -> str:
+    """Build a compact JWS from raw header bytes and a claims object."""
+    signing_input = token._b64url(header) + b"." + token._b64url(orjson.dumps(claims))
+    return (signing_input + b"." + token._b64url(key.sign(signing_input))).decode("ascii")
+
+
+def _claims(**overrides):
+    claims = {
+        "sub": "user",
+        "client_id": "client",
+        "exp": int(time.time()) + 300,
+        "aud": settings.SERVER_URL,
+    }
+    claims.update(overrides)
+    return claims
+
+
+def test_round_trip(signing_key):
+    access_token, expires_in = token.create_access_token("client", "user", "mcp:tools:read")
+
+    claims = token.verify_access_token(access_token)
+
+    assert claims["sub"] == "user"
+    assert claims["client_id"] == "client"
+    assert claims["scope"] == "mcp:tools:read"
+    assert claims["exp"] - claims["iat"] == expires_in
+
+
+def test_tampered_signature(signing_key):
+    access_token, _ = token.create_access_token("client", "user")
+    head, _, signature = access_token.rpartition(".")
+    tampered = head + "." + ("B" if signature[0] == "A" else "A") + signature[1:]
+
+    with pytest.raises(JWTError):
+        token._decode_eddsa(tampered)
+
+
+def test_wrong_alg_header(signing_key):
+    forged = _sign(signing_key, b'{"alg":"HS256","typ":"JWT"}', _claims())
+
+    with pytest.raises(JWTError):
+        token._decode_eddsa(forged)
+
+
+def test_expired_exp(signing_key):
+    expired = _sign(signing_key, b'{"alg":"EdDSA","typ":"JWT"}', _claims(exp=int(time.time()) - 1))
+
+    with pytest.raises(ExpiredSignatureError):
+        token._decode_eddsa(expired)
+
+
+def test_wrong_aud(signing_key):
+    foreign = _sign(signing_key, b'{"alg":"EdDSA","typ":"JWT"}', _claims(aud="https://other.example"))
+
+    with pytest.raises(JWTClaimsError):
+        token._decode_eddsa(foreign)
+
+
+def test_non_object_header(signing_key):
+    malformed = _sign(signing_key, b"[]", _claims())
+
+    with pytest.raises(JWTError):
+        token._decode_eddsa(malformed)
+
+
+def test_rejection_is_401(signing_key):
+    forged = _sign(signing_key, b'"EdDSA"', _claims())
+
+    with pytest.raises(HTTPException) as exc_info:
+        token.verify_access_token(forged)
+
+    assert exc_info.value.status_code == 401
@@ -5,15 +5,83 @@ This test demonstrates the complete OAuth + MCP flow:
 1. Dynamic Client Registration
 2. Authorization Request
 3. Token Exchange (with PKCE)
-4. MCP Tool Invocation
+4. MCP Tool Invocation (initialize, list and call sent concurrently)
 5. Token Refresh
 """
 
+import asyncio
+import functools
+import io
+import os
+import sys
 import httpx
 import hashlib
 import base64
 import secrets
-from urllib.parse import urlparse, parse_qs
+import orjson
+
+
+def _b64url(data: bytes) -> str:
+    """Base64url-encode without padding (stripped on bytes, before decoding)."""
+    return base64.urlsafe_b64encode(data).translate(None, b'=').decode('ascii')
+
+
+# Headers for JSON request bodies sent as pre-encoded content
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Static JSON-RPC request bodies, encoded once at import
+_INITIALIZE_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "0.1.0",
+        "clientInfo": {
+            "name": "Test Client",
+            "version": "1.0.0"
+        }
+    }
+})
+
+_LIST_TOOLS_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/list",
+    "params": {}
+})
+
+_CALL_WEATHER_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 3,
+    "method": "tools/call",
+    "params": {
+        "name": "get_weather",
+        "arguments": {
+            "location": "San Francisco, CA",
+            "units": "fahrenheit"
+        }
+    }
+})
+
+_CALL_PROFILE_BODY = orjson.dumps({
+    "jsonrpc": "2.0",
+    "id": 4,
+    "method": "tools/call",
+    "params": {
+        "name": "get_user_profile",
+        "arguments": {}
+    }
+})
+
+_BATCH_BODY = orjson.dumps([
+    {"jsonrpc": "2.0", "id": 5, "method": "tools/list", "params": {}},
+    {
+        "jsonrpc": "2.0",
+        "id": 6,
+        "method": "tools/call",
+        "params": {"name": "list_files", "arguments": {"path": "/home/user", "pattern": "*.txt"}}
+    },
+])
 
 
 class TestOAuthMCPFlow:
@@ -25,25 +93,49 @@ class TestOAuthMCPFlow:
     def generate_pkce_pair():
         """Generate PKCE code verifier and challenge."""
         # Generate code verifier
-        code_verifier = base64.urlsafe_b64encode(
-            secrets.token_bytes(32)
-        ).decode('utf-8').rstrip('=')
+        code_verifier = secrets.token_urlsafe(32)
 
         # Generate code challenge (S256)
-        digest = hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        code_challenge = base64.urlsafe_b64encode(digest).decode('utf-8').rstrip('=')
+        digest = hashlib.sha256(code_verifier.encode('ascii')).digest()
+        code_challenge = _b64url(digest)
 
         return code_verifier, code_challenge
 
+    async def _mcp_calls(self, access_token):
+        """Send initialize, tools/list and tools/call concurrently."""
+        headers = {**_JSON_HEADERS, "Authorization": f"Bearer {access_token}"}
+        async with httpx.AsyncClient(base_url=self.BASE_URL) as client:
+            return await asyncio.gather(
+                client.post("/mcp/initialize", content=_INITIALIZE_BODY, headers=_JSON_HEADERS),
+                client.post("/mcp/tools/list", content=_LIST_TOOLS_BODY, headers=headers),
+                client.post("/mcp/tools/call", content=_CALL_WEATHER_BODY, headers=headers),
+            )
+
     def test_complete_flow(self):
-        """Test the complete OAuth + MCP flow."""
+        """
+        Test the complete OAuth + MCP flow.
+
+        Progress output is buffered and written once at the end, only if the
+        flow fails or FLOW_VERBOSE is set, instead of one print per step.
+        """
+        out = io.StringIO()
+        try:
+            self._run_flow(functools.partial(print, file=out))
+        except BaseException:
+            sys.stdout.write(out.getvalue())
+            raise
+        if os.environ.get("FLOW_VERBOSE"):
+            sys.stdout.write(out.getvalue())
+
+    def _run_flow(self, log):
+        """Run every step of the flow, reporting progress through log()."""
         with httpx.Client() as client:
             # ================================================================
             # Step 1: Dynamic Client Registration (RFC 7591)
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 1: Dynamic Client Registration")
-            print("=" * 60)
+            log("\n" + "=" * 60)
+            log("Step 1: Dynamic Client Registration")
+            log("=" * 60)
 
             registration_request = {
                 "redirect_uris": ["http://localhost:3000/callback"],
@@ -57,34 +149,34 @@ class TestOAuthMCPFlow:
             )
 
             assert response.status_code == 200
-            registration_response = response.json()
+            registration_response = orjson.loads(response.content)
 
             client_id = registration_response["client_id"]
             client_secret = registration_response["client_secret"]
 
-            print(f"✓ Client registered successfully")
-            print(f"  Client ID: {client_id}")
-            print(f"  Client Secret: {client_secret[:10]}...")
+            log(f"✓ Client registered successfully")
+            log(f"  Client ID: {client_id}")
+            log(f"  Client Secret: {client_secret[:10]}...")
 
             # ================================================================
             # Step 2: Generate PKCE Parameters
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 2: Generate PKCE Parameters")
-            print("=" * 60)
+            log("\n" + "=" * 60)
+            log("Step 2: Generate PKCE Parameters")
+            log("=" * 60)
 
             code_verifier, code_challenge = self.generate_pkce_pair()
 
-            print(f"✓ PKCE parameters generated")
-            print(f"  Code Verifier: {code_verifier[:20]}...")
-            print(f"  Code Challenge: {code_challenge[:20]}...")
+            log(f"✓ PKCE parameters generated")
+            log(f"  Code Verifier: {code_verifier[:20]}...")
+            log(f"  Code Challenge: {code_challenge[:20]}...")
 
             # ================================================================
             # Step 3: Authorization Request
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 3: Authorization Request")
-            print("=" * 60)
+            log("\n" + "=" * 60)
+            log("Step 3: Authorization Request")
+            log("=" * 60)
 
             auth_params = {
                 "response_type": "code",
@@ -106,24 +198,25 @@ class TestOAuthMCPFlow:
             assert response.status_code == 307  # Redirect
             redirect_url = response.headers["location"]
 
-            # Extract authorization code from redirect
-            parsed_url = urlparse(redirect_url)
-            query_params = parse_qs(parsed_url.query)
-            authorization_code = query_params["code"][0]
-            returned_state = query_params["state"][0]
+            # Extract authorization code from redirect (both values are
+            # URL-safe as issued, so no percent-decoding is needed)
+            _, _, query = redirect_url.partition("?")
+            query_params = dict(pair.split("=", 1) for pair in query.split("&"))
+            authorization_code = query_params["code"]
+            returned_state = query_params["state"]
 
             assert returned_state == "random_state_123"
 
-            print(f"✓ Authorization code obtained")
-            print(f"  Code: {authorization_code[:20]}...")
-            print(f"  State verified: {returned_state}")
+            log(f"✓ Authorization code obtained")
+            log(f"  Code: {authorization_code[:20]}...")
+            log(f"  State verified: {returned_state}")
 
             # ================================================================
             # Step 4: Token Exchange (with PKCE validation)
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 4: Token Exchange")
-            print("=" * 60)
+            log("\n" + "=" * 60)
+            log("Step 4: Token Exchange")
+            log("=" * 60)
 
             token_request = {
                 "grant_type": "authorization_code",
@@ -139,120 +232,77 @@ class TestOAuthMCPFlow:
             )
 
             if response.status_code != 200:
-                print(f"\n❌ Token exchange failed!")
-                print(f"  Status Code: {response.status_code}")
-                print(f"  Response Body: {response.text}")
-                print(f"  Request Data: {token_request}")
+                log(f"\n❌ Token exchange failed!")
+                log(f"  Status Code: {response.status_code}")
+                log(f"  Response Body: {response.text}")
+                log(f"  Request Data: {token_request}")
 
             assert response.status_code == 200, f"Expected 200, got {response.status_code}. Response: {response.text}"
-            token_response = response.json()
+            token_response = orjson.loads(response.content)
 
             access_token = token_response["access_token"]
             refresh_token = token_response["refresh_token"]
 
-            print(f"✓ Tokens obtained successfully")
-            print(f"  Access Token: {access_token[:30]}...")
-            print(f"  Refresh Token: {refresh_token[:30]}...")
-            print(f"  Expires In: {token_response['expires_in']} seconds")
+            log(f"✓ Tokens obtained successfully")
+            log(f"  Access Token: {access_token[:30]}...")
+            log(f"  Refresh Token: {refresh_token[:30]}...")
+            log(f"  Expires In: {token_response['expires_in']} seconds")
 
             # ================================================================
-            # Step 5: MCP Initialize (no auth required)
+            # Steps 5-7: MCP Initialize, List Tools, Call Tool
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 5: MCP Initialize")
-            print("=" * 60)
-
-            initialize_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "0.1.0",
-                    "clientInfo": {
-                        "name": "Test Client",
-                        "version": "1.0.0"
-                    }
-                }
-            }
+            # The three MCP calls only depend on the access token, so they are
+            # sent concurrently and their results checked in step order below
+            initialize_http, tools_http, tool_http = asyncio.run(self._mcp_calls(access_token))
 
-            response = client.post(
-                f"{self.BASE_URL}/mcp/initialize",
-                json=initialize_request
-            )
+            # ================================================================
+            # Step 5: MCP Initialize (no auth required)
+            # ================================================================
+            log("\n" + "=" * 60)
+            log("Step 5: MCP Initialize")
+            log("=" * 60)
 
-            assert response.status_code == 200
-            initialize_response = response.json()
+            assert initialize_http.status_code == 200
+            initialize_response = orjson.loads(initialize_http.content)
 
-            print(f"✓ MCP initialized")
-            print(f"  Server: {initialize_response['result']['serverInfo']['name']}")
-            print(f"  Version: {initialize_response['result']['serverInfo']['version']}")
+            log(f"✓ MCP initialized")
+            log(f"  Server: {initialize_response['result']['serverInfo']['name']}")
+            log(f"  Version: {initialize_response['result']['serverInfo']['version']}")
 
             # ================================================================
             # Step 6: List MCP Tools (requires auth)
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 6: List MCP Tools")
-            print("=" * 60)
-
-            list_tools_request = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {}
-            }
+            log("\n" + "=" * 60)
+            log("Step 6: List MCP Tools")
+            log("=" * 60)
 
-            response = client.post(
-                f"{self.BASE_URL}/mcp/tools/list",
-                json=list_tools_request,
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-
-            assert response.status_code == 200
-            tools_response = response.json()
+            assert tools_http.status_code == 200
+            tools_response = orjson.loads(tools_http.content)
 
-            print(f"✓ Tools listed successfully")
+            log(f"✓ Tools listed successfully")
             for tool in tools_response["result"]["tools"]:
-                print(f"  - {tool['name']}: {tool['description']}")
+                log(f"  - {tool['name']}: {tool['description']}")
 
             # ================================================================
             # Step 7: Call MCP Tool (requires auth)
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 7: Call MCP Tool - get_weather")
-            print("=" * 60)
-
-            call_tool_request = {
-                "jsonrpc": "2.0",
-                "id": 3,
-                "method": "tools/call",
-                "params": {
-                    "name": "get_weather",
-                    "arguments": {
-                        "location": "San Francisco, CA",
-                        "units": "fahrenheit"
-                    }
-                }
-            }
+            log("\n" + "=" * 60)
+            log("Step 7: Call MCP Tool - get_weather")
+            log("=" * 60)
 
-            response = client.post(
-                f"{self.BASE_URL}/mcp/tools/call",
-                json=call_tool_request,
-                headers={"Authorization": f"Bearer {access_token}"}
-            )
-
-            assert response.status_code == 200
-            tool_response = response.json()
+            assert tool_http.status_code == 200
+            tool_response = orjson.loads(tool_http.content)
 
-            print(f"✓ Tool executed successfully")
-            print(f"  Result: {tool_response['result']['message']}")
-            print(f"  Data: {tool_response['result']['data']}")
+            log(f"✓ Tool executed successfully")
+            log(f"  Result: {tool_response['result']['message']}")
+            log(f"  Data: {tool_response['result']['data']}")
 
             # ================================================================
             # Step 8: Refresh Token
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 8: Refresh Access Token")
-            print("=" * 60)
+            log("\n" + "=" * 60)
+            log("Step 8: Refresh Access Token")
+            log("=" * 60)
 
             refresh_request = {
                 "grant_type": "refresh_token",
@@ -266,92 +316,105 @@ class TestOAuthMCPFlow:
             )
 
             assert response.status_code == 200
-            refresh_response = response.json()
+            refresh_response = orjson.loads(response.content)
 
             new_access_token = refresh_response["access_token"]
 
-            print(f"✓ Token refreshed successfully")
-            print(f"  New Access Token: {new_access_token[:30]}...")
+            log(f"✓ Token refreshed successfully")
+            log(f"  New Access Token: {new_access_token[:30]}...")
 
             # ================================================================
             # Step 9: Use New Token for Another Tool Call
             # ================================================================
-            print("\n" + "=" * 60)
-            print("Step 9: Call Another Tool with New Token")
-            print("=" * 60)
-
-            call_tool_request = {
-                "jsonrpc": "2.0",
-                "id": 4,
-                "method": "tools/call",
-                "params": {
-                    "name": "get_user_profile",
-                    "arguments": {}
-                }
-            }
+            log("\n" + "=" * 60)
+            log("Step 9: Call Another Tool with New Token")
+            log("=" * 60)
 
             response = client.post(
                 f"{self.BASE_URL}/mcp/tools/call",
-                json=call_tool_request,
-                headers={"Authorization": f"Bearer {new_access_token}"}
+                content=_CALL_PROFILE_BODY,
+                headers={**_JSON_HEADERS, "Authorization": f"Bearer {new_access_token}"}
             )
 
             assert response.status_code == 200
-            profile_response = response.json()
+            profile_response = orjson.loads(response.content)
 
-            print(f"✓ Tool executed with new token")
-            print(f"  User: {profile_response['result']['data']['username']}")
-            print(f"  Email: {profile_response['result']['data']['email']}")
+            log(f"✓ Tool executed with new token")
+            log(f"  User: {profile_response['result']['data']['username']}")
+            log(f"  Email: {profile_response['result']['data']['email']}")
 
-            print("\n" + "=" * 60)
-            print("✅ ALL TESTS PASSED!")
-            print("=" * 60)
+            # ================================================================
+            # Step 10: JSON-RPC Batch Request
+            # ================================================================
+            log("\n" + "=" * 60)
+            log("Step 10: Batch tools/list and tools/call")
+            log("=" * 60)
+
+            response = client.post(
+                f"{self.BASE_URL}/mcp",
+                content=_BATCH_BODY,
+                headers={**_JSON_HEADERS, "Authorization": f"Bearer {new_access_token}"}
+            )
+
+            assert response.status_code == 200
+            batch_response = orjson.loads(response.content)
+            assert [r["id"] for r in batch_response] == [5, 6]
+            assert len(batch_response[0]["result"]["tools"]) > 0
+            assert batch_response[1]["result"]["success"] is True
+            # Patterns are anchored globs: "*.txt" must match the whole name
+            files = batch_response[1]["result"]["data"]["files"]
+            assert [f["name"] for f in files] == ["document.txt"]
+
+            log(f"✓ Batch of {len(batch_response)} requests executed")
+
+            log("\n" + "=" * 60)
+            log("✅ ALL TESTS PASSED!")
+            log("=" * 60)
 
 
 if __name__ == "__main__":
-    import sys
     import time
 
-    # Add retry logic for CI/CD environments where server might need extra time
-    max_retries = 3
-    retry_delay = 2
-
-    for attempt in range(max_retries):
-        try:
-            # Quick health check before running tests
-            with httpx.Client() as client:
-                try:
-                    response = client.get(f"{TestOAuthMCPFlow.BASE_URL}/health", timeout=5.0)
-                    if response.status_code != 200:
-                        if attempt < max_retries - 1:
-                            print(f"⚠ Server health check failed (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s...")
-                            time.sleep(retry_delay)
-                            continue
-                        else:
-                            print("❌ Server health check failed after all retries")
-                            sys.exit(1)
-                except httpx.ConnectError:
-                    if attempt < max_retries - 1:
-                        print(f"⚠ Cannot connect to server (attempt {attempt + 1}/{max_retries}), retrying in {retry_delay}s...")
-                        time.sleep(retry_delay)
-                        continue
-                    else:
-                        print(f"❌ ERROR: Cannot connect to server at {TestOAuthMCPFlow.BASE_URL}")
-                        print("   Make sure the server is running:")
-                        print("   cd server && uvicorn app.main:app --reload")
-                        sys.exit(1)
-
-            # Run the test
-            test = TestOAuthMCPFlow()
-            test.test_complete_flow()
-            print("\n✅ Test suite completed successfully")
-            sys.exit(0)
-
-        except AssertionError as e:
-            print(f"\n❌ Test assertion failed: {e}")
-            sys.exit(1)
-        except Exception as e:
-            print(f"\n❌ Unexpected error: {e}")
-            import traceback
-            traceback.print_exc()
-            sys.exit(1)
+    # Poll /health until the server answers or the deadline passes; in CI the
+    # server is usually already up, so this returns after the first probe
+    deadline = time.monotonic() + 6.0
+    delay = 0.05
+    status_code = None
+
+    with httpx.Client() as client:
+        while True:
+            try:
+                status_code = client.get(f"{TestOAuthMCPFlow.BASE_URL}/health", timeout=0.5).status_code
+                if status_code == 200:
+                    break
+            except httpx.TransportError:
+                status_code = None
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+
+    if status_code is None:
+        print(f"❌ ERROR: Cannot connect to server at {TestOAuthMCPFlow.BASE_URL}")
+        print("   Make sure the server is running:")
+        print("   cd server && uvicorn app.main:app --reload")
+        sys.exit(1)
+    if status_code != 200:
+        print(f"❌ Server health check failed (status {status_code})")
+        sys.exit(1)
+
+    try:
+        # Run the test
+        test = TestOAuthMCPFlow()
+        test.test_complete_flow()
+        print("\n✅ Test suite completed successfully")
+        sys.exit(0)
+
+    except AssertionError as e:
+        print(f"\n❌ Test assertion failed: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,106 @@
+"""
+Unit tests for MCP JSON-RPC request handling, run in-process.
+
+Authentication is overridden with fixed claims (except for the claims-cache
+test); the OAuth flow itself is covered end to end by test_flow.py.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "server"))
+
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.mcp.protocol import get_current_user  # noqa: E402
+from app.oauth.token import create_access_token, verify_access_token_cached  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+# One past the largest id orjson can encode
+_OVERSIZED_ID = 2**64
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: {"sub": "test-user"}
+    try:
+        with TestClient(app) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.parametrize("path", ["/mcp/initialize", "/mcp/tools/list"])
+def test_oversized_integer_id_is_rejected(client, path):
+    response = client.post(path, json={"jsonrpc": "2.0", "id": _OVERSIZED_ID})
+
+    assert response.status_code == 422
+
+
+def test_64_bit_id_is_echoed(client):
+    response = client.post("/mcp/initialize", json={"jsonrpc": "2.0", "id": 2**64 - 1})
+
+    assert response.status_code == 200
+    assert response.json()["id"] == 2**64 - 1
+
+
+def test_oversized_id_in_batch_is_invalid_request(client):
+    response = client.post("/mcp", json=[
+        {"jsonrpc": "2.0", "id": _OVERSIZED_ID, "method": "tools/list"},
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+    ])
+
+    assert response.status_code == 200
+    invalid, listed = response.json()
+    assert invalid == {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}
+    assert listed["id"] == 1
+
+
+def test_batch_over_limit_is_rejected(client):
+    batch = [
+        {"jsonrpc": "2.0", "id": i, "method": "tools/list"}
+        for i in range(settings.MCP_MAX_BATCH_SIZE + 1)
+    ]
+
+    response = client.post("/mcp", json=batch)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["id"] is None
+    assert body["error"]["code"] == -32600
+
+
+def test_batch_omits_notifications(client):
+    response = client.post("/mcp", json=[
+        {"jsonrpc": "2.0", "method": "tools/list"},
+        {"jsonrpc": "2.0", "id": 7, "method": "tools/list"},
+        {"jsonrpc": "2.0", "method": "no/such/method"},
+    ])
+
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()] == [7]
+
+
+@pytest.mark.parametrize("payload", [
+    {"jsonrpc": "2.0", "method": "tools/list"},
+    [{"jsonrpc": "2.0", "method": "tools/list"}],
+])
+def test_notifications_only_get_no_body(client, payload):
+    response = client.post("/mcp", json=payload)
+
+    assert response.status_code == 202
+    assert response.content == b""
+
+
+def test_cached_claims_are_read_only():
+    access_token, _ = create_access_token("client", "user")
+
+    claims = verify_access_token_cached(access_token)
+    with pytest.raises(TypeError):
+        claims["sub"] = "someone-else"
+
+    assert verify_access_token_cached(access_token)["sub"] == "user"
@@ -8,9 +8,10 @@ directly calling the authorization endpoint and extracting the code.
 
 import json
 import sys
+import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
-
-import httpx
+from urllib.parse import urlparse, parse_qs
 
 # Import client classes (without running main)
 # Add parent directory to path since client.py is in root
@@ -18,18 +19,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from client import MCPOAuthClient, ClientStorage, PKCEHelper
 
 
-def test_client_flow():
-    """Test the complete client flow."""
+def test_client_flow(tmp_path: Path):
+    """
+    Test the complete client flow.
+
+    Client storage lives in tmp_path, which pytest creates per test and
+    removes itself, so runs never share or leave behind a storage file.
+    """
     print("=" * 70)
     print("Testing MCP OAuth DCR Client")
     print("=" * 70)
 
     server_url = "http://localhost:8000"
-    storage_path = Path(".test_clients.json")
-
-    # Clean up any existing test storage
-    if storage_path.exists():
-        storage_path.unlink()
+    storage_path = tmp_path / "clients.json"
 
     # Initialize storage and client
     storage = ClientStorage(storage_path)
@@ -71,62 +73,61 @@ def test_client_flow():
     code_verifier = PKCEHelper.generate_code_verifier()
     code_challenge = PKCEHelper.generate_code_challenge(code_verifier)
 
-    # Manually call authorization endpoint (simulating browser)
-    with httpx.Client() as http_client:
-        auth_params = {
-            "response_type": "code",
-            "client_id": client.client_id,
-            "redirect_uri": client.redirect_uri,
-            "scope": "mcp:tools:read mcp:tools:execute",
-            "state": "test_state_123",
-            "code_challenge": code_challenge,
-            "code_challenge_method": "S256",
-        }
-
-        response = http_client.get(
-            f"{server_url}/oauth/authorize",
-            params=auth_params,
-            follow_redirects=False
-        )
-
-        assert response.status_code == 307, f"Expected 307, got {response.status_code}"
-
-        # Extract authorization code from redirect
-        from urllib.parse import urlparse, parse_qs
-        redirect_url = response.headers["location"]
-        parsed_url = urlparse(redirect_url)
-        query_params = parse_qs(parsed_url.query)
-        authorization_code = query_params["code"][0]
-
-        print(f"✓ Authorization code obtained: {authorization_code[:20]}...")
-
-        # Exchange code for token
-        token_request = {
-            "grant_type": "authorization_code",
-            "code": authorization_code,
-            "redirect_uri": client.redirect_uri,
-            "code_verifier": code_verifier,
-            "client_id": client.client_id,
-        }
-
-        response = http_client.post(
-            f"{server_url}/oauth/token",
-            data=token_request
-        )
-
-        assert response.status_code == 200, f"Token exchange failed: {response.status_code} - {response.text}"
-        token_response = response.json()
-
-        client.access_token = token_response["access_token"]
-        client.refresh_token = token_response.get("refresh_token")
-
-        print(f"✓ Access token obtained: {client.access_token[:30]}...")
-        print(f"✓ Refresh token obtained: {client.refresh_token[:30]}...")
-
-        # Save to storage
-        from datetime import datetime, timedelta
-        client.token_expires_at = datetime.now() + timedelta(seconds=token_response.get("expires_in", 3600))
-        client._save_client()
+    # Manually call authorization endpoint (simulating browser), reusing the
+    # client's pooled connection from discovery and registration
+    http_client = client._get_client()
+    auth_params = {
+        "response_type": "code",
+        "client_id": client.client_id,
+        "redirect_uri": client.redirect_uri,
+        "scope": "mcp:tools:read mcp:tools:execute",
+        "state": "test_state_123",
+        "code_challenge": code_challenge,
+        "code_challenge_method": "S256",
+    }
+
+    response = http_client.get(
+        f"{server_url}/oauth/authorize",
+        params=auth_params,
+        follow_redirects=False
+    )
+
+    assert response.status_code == 307, f"Expected 307, got {response.status_code}"
+
+    # Extract authorization code from redirect
+    redirect_url = response.headers["location"]
+    parsed_url = urlparse(redirect_url)
+    query_params = parse_qs(parsed_url.query)
+    authorization_code = query_params["code"][0]
+
+    print(f"✓ Authorization code obtained: {authorization_code[:20]}...")
+
+    # Exchange code for token
+    token_request = {
+        "grant_type": "authorization_code",
+        "code": authorization_code,
+        "redirect_uri": client.redirect_uri,
+        "code_verifier": code_verifier,
+        "client_id": client.client_id,
+    }
+
+    response = http_client.post(
+        f"{server_url}/oauth/token",
+        data=token_request
+    )
+
+    assert response.status_code == 200, f"Token exchange failed: {response.status_code} - {response.text}"
+    token_response = response.json()
+
+    client.access_token = token_response["access_token"]
+    client.refresh_token = token_response.get("refresh_token")
+
+    print(f"✓ Access token obtained: {client.access_token[:30]}...")
+    print(f"✓ Refresh token obtained: {client.refresh_token[:30]}...")
+
+    # Save to storage
+    client.token_expires_at = datetime.now() + timedelta(seconds=token_response.get("expires_in", 3600))
+    client._save_client()
 
     # ================================================================
     # Test 4: List Tools
@@ -165,6 +166,17 @@ def test_client_flow():
     assert result is not None, "get_user_profile failed"
     print("✓ get_user_profile executed")
 
+    # Call several tools concurrently
+    results = client.call_tools([
+        ("get_weather", {"location": "Boston, MA"}),
+        ("list_files", {"path": "/home/user"}),
+        ("get_user_profile", {}),
+    ])
+    assert len(results) == 3, "Expected one result per tool call"
+    assert all(r is not None for r in results), "Concurrent tool calls failed"
+    assert results[0]["data"]["location"] == "Boston, MA", "Results out of order"
+    print("✓ Concurrent tool calls executed")
+
     # ================================================================
     # Test 6: Token Refresh
     # ================================================================
@@ -219,6 +231,8 @@ def test_client_flow():
     client_reloaded = MCPOAuthClient(server_url, storage)
     assert client_reloaded.client_id == client.client_id, "Client ID mismatch"
     assert client_reloaded.access_token == client.access_token, "Access token mismatch"
+    assert client_reloaded._endpoints.get("token_endpoint") == metadata["token_endpoint"], \
+        "Endpoints not persisted"
     print("✓ Client state reloaded from storage")
 
     # Use reloaded client
@@ -226,16 +240,16 @@ def test_client_flow():
     assert tools is not None, "Reloaded client failed to list tools"
     print("✓ Reloaded client functional")
 
-    # ================================================================
-    # Cleanup
-    # ================================================================
-    print("\n" + "=" * 70)
-    print("Cleanup")
-    print("=" * 70)
-
-    if storage_path.exists():
-        storage_path.unlink()
-        print("✓ Test storage cleaned up")
+    # Closing writes out coalesced saves, so another reader of the file sees
+    # the latest tokens and nothing lands after tmp_path is removed
+    client.close()
+    client_reloaded.close()
+    on_disk = ClientStorage(storage_path)
+    assert on_disk.get_client(server_url)["access_token"] == client_reloaded.access_token, \
+        "Refreshed token not written on close"
+    on_disk.close()
+    storage.close()
+    print("✓ Storage flushed on close")
 
     print("\n" + "=" * 70)
     print("✅ ALL TESTS PASSED!")
@@ -244,7 +258,8 @@ def test_client_flow():
 
 if __name__ == "__main__":
     try:
-        test_client_flow()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_client_flow(Path(tmp_dir))
     except AssertionError as e:
         print(f"\n❌ Test assertion failed: {e}")
         sys.exit(1)
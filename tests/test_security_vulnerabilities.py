@@ -10,12 +10,12 @@ Tests the critical findings from the LLM code assessment:
 These tests verify vulnerabilities exist and serve as regression tests
 once fixes are implemented.
 """
+import asyncio
+import re
 import pytest
 import httpx
 import time
 from datetime import datetime, timezone, timedelta
-from concurrent.futures import ThreadPoolExecutor
-from unittest.mock import patch
 
 
 class TestAuthCodeRaceCondition:
@@ -51,22 +51,21 @@ class TestAuthCodeRaceCondition:
         if not auth_data["code"]:
             pytest.skip("Failed to obtain authorization code")
 
+        # Both attempts send the identical form, so build it once
+        token_request = {
+            "grant_type": "authorization_code",
+            "code": auth_data["code"],
+            "redirect_uri": auth_data["redirect_uri"],
+            "code_verifier": auth_data["verifier"],
+            "client_id": client["client_id"],
+            "client_secret": client["client_secret"],
+        }
+
         # Attempt to exchange the SAME code TWICE concurrently
-        def exchange_code(attempt_num: int):
+        async def exchange_code(async_client: httpx.AsyncClient, request: httpx.Request, attempt_num: int):
             """Exchange authorization code for token."""
             try:
-                response = httpx.post(
-                    f"{server_url}/oauth/token",
-                    data={
-                        "grant_type": "authorization_code",
-                        "code": auth_data["code"],
-                        "redirect_uri": auth_data["redirect_uri"],
-                        "code_verifier": auth_data["verifier"],
-                        "client_id": client["client_id"],
-                        "client_secret": client["client_secret"],
-                    },
-                    timeout=5.0
-                )
+                response = await async_client.send(request)
                 return {
                     "attempt": attempt_num,
                     "status": response.status_code,
@@ -80,13 +79,22 @@ class TestAuthCodeRaceCondition:
                     "error": str(e)
                 }
 
-        # Execute concurrent exchanges
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future1 = executor.submit(exchange_code, 1)
-            future2 = executor.submit(exchange_code, 2)
+        async def race():
+            # Both coroutines are scheduled on the same event loop tick, so the
+            # requests leave within microseconds of each other (no thread startup)
+            async with httpx.AsyncClient(base_url=server_url, timeout=5.0) as async_client:
+                # Encode both requests up front so only send() runs inside gather
+                requests = [
+                    async_client.build_request("POST", "/oauth/token", data=token_request)
+                    for _ in range(2)
+                ]
+                return await asyncio.gather(
+                    exchange_code(async_client, requests[0], 1),
+                    exchange_code(async_client, requests[1], 2)
+                )
 
-            result1 = future1.result()
-            result2 = future2.result()
+        # Execute concurrent exchanges
+        result1, result2 = asyncio.run(race())
 
         successes = sum(1 for r in [result1, result2] if r["success"])
 
@@ -126,16 +134,18 @@ class TestDatetimeTimezoneMismatch:
         # Simulate token expiration calculation
         expires_in_seconds = 3600  # 1 hour
 
+        # Sample the clock once so both calculations see the same instant
+        now = time.time()
+
         # Server calculation (UTC)
-        server_expiration = datetime.utcnow() + timedelta(seconds=expires_in_seconds)
+        server_expiration = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None) \
+            + timedelta(seconds=expires_in_seconds)
 
         # Client calculation (local time, without timezone awareness)
-        client_expiration = datetime.now() + timedelta(seconds=expires_in_seconds)
+        client_expiration = datetime.fromtimestamp(now) + timedelta(seconds=expires_in_seconds)
 
-        # Calculate offset
-        utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
-        local_now = datetime.now()
-        offset = (local_now - utc_now).total_seconds()
+        # Calculate offset (local UTC offset at that instant, DST included)
+        offset = time.localtime(now).tm_gmtoff
 
         # If offset > 60 seconds, there's a timezone mismatch
         if abs(offset) > 60:
@@ -178,6 +188,10 @@ class TestDatetimeTimezoneMismatch:
         assert True, "This demonstrates the correct approach"
 
 
+# The resource entry in client.py's request dicts, in either quote style
+_RESOURCE_PARAM_RE = re.compile(r"""["']resource["']\s*:\s*self\.server_url""")
+
+
 class TestMissingResourceParameter:
     """
     Tests for missing resource parameter (MCP spec violation).
@@ -187,7 +201,7 @@ class TestMissingResourceParameter:
     Location: client.py:326 (authorization), client.py:382 (token exchange)
     """
 
-    def test_authorization_request_missing_resource(self):
+    def test_authorization_request_missing_resource(self, client_source):
         """
         REGRESSION TEST: Verify resource parameter is present in authorization request.
 
@@ -196,14 +210,9 @@ class TestMissingResourceParameter:
         This test was originally a vulnerability test but has been updated
         to verify the fix is present in client.py:341
         """
-        # Read the actual client.py code to verify resource parameter is present
-        from pathlib import Path
-        client_file = Path(__file__).parent.parent / "client.py"
-        client_code = client_file.read_text()
-
         # Verify the auth_params dict includes resource parameter
         # Should be around line 333-342 in the authorize() method
-        if '"resource": self.server_url' not in client_code and "'resource': self.server_url" not in client_code:
+        if not _RESOURCE_PARAM_RE.search(client_source):
             pytest.fail(
                 "VULNERABILITY CONFIRMED: 'resource' parameter missing "
                 "from authorization request. "
@@ -214,21 +223,16 @@ class TestMissingResourceParameter:
         # Test passes - resource parameter is present
         assert True, "✓ Resource parameter present in authorization request"
 
-    def test_token_request_missing_resource(self):
+    def test_token_request_missing_resource(self, client_source):
         """
         REGRESSION TEST: Verify resource parameter is present in token exchange request.
 
         This test was originally a vulnerability test but has been updated
         to verify the fix is present in client.py:405
         """
-        # Read the actual client.py code to verify resource parameter is present
-        from pathlib import Path
-        client_file = Path(__file__).parent.parent / "client.py"
-        client_code = client_file.read_text()
-
         # Verify the token_request dict includes resource parameter
         # Should be around line 399-406 in the _exchange_code_for_token() method
-        if '"resource": self.server_url' not in client_code and "'resource': self.server_url" not in client_code:
+        if not _RESOURCE_PARAM_RE.search(client_source):
             pytest.fail(
                 "VULNERABILITY CONFIRMED: 'resource' parameter missing "
                 "from token request. "
@@ -246,26 +250,19 @@ class TestPKCEImplementation:
     Verifies PKCE math is correct and checks for timing attacks.
     """
 
-    def test_pkce_challenge_generation_correct(self):
+    def test_pkce_challenge_generation_correct(self, pkce_params):
         """
         Verify PKCE code challenge generation is mathematically correct.
 
         This should PASS - the cryptographic implementation is correct.
+        Uses the session's shared pkce_params pair (S256) instead of
+        generating another one.
         """
-        import base64
-        import hashlib
-        import secrets
-
-        # Generate verifier (same as client.py:109-111)
-        verifier = base64.urlsafe_b64encode(
-            secrets.token_bytes(32)
-        ).decode('utf-8').rstrip('=')
-
-        # Generate challenge (same as client.py:116-117)
-        digest = hashlib.sha256(verifier.encode('utf-8')).digest()
-        challenge = base64.urlsafe_b64encode(digest).decode('utf-8').rstrip('=')
+        verifier = pkce_params["verifier"]
+        challenge = pkce_params["challenge"]
 
         # Verify
+        assert pkce_params["method"] == "S256"
         assert len(verifier) >= 43, "Verifier too short"
         assert len(challenge) == 43, "Challenge should be 43 chars (SHA-256 base64)"
 